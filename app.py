@@ -1,37 +1,38 @@
 import sys
 import os
 
-import certifi
-ca = certifi.where()
-
-from dotenv import load_dotenv
-load_dotenv()
-mongo_db_url = os.getenv("MONGODB_URL_KEY")
-print(mongo_db_url)
-import pymongo
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
-from networksecurity.pipeline.training_pipeline import TrainingPipeline
+from networksecurity.pipeline.training_job import TrainingJobRunner
 
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi import FastAPI, File, UploadFile,Request
+from fastapi import FastAPI, File, UploadFile,Request,HTTPException
 from uvicorn import run as app_run
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import RedirectResponse
-import pandas as pd
+import numpy as np
+from typing import Dict
+import shutil
+import tempfile
 
-from networksecurity.utils.main_utils.utils import load_object
-
-from networksecurity.utils.ml_utils.model.estimator import NetworkModel
-
-
-client = pymongo.MongoClient(mongo_db_url, tlsCAFile=ca)
-
-from networksecurity.constant.training_pipeline import DATA_INGESTION_COLLECTION_NAME
-from networksecurity.constant.training_pipeline import DATA_INGESTION_DATABASE_NAME
+from networksecurity.utils.ml_utils.model.model_cache import NetworkModelCache
+from networksecurity.pipeline.batch_prediction import BatchPrediction
+from networksecurity.utils.ml_utils.model.prediction_batcher import PredictionBatcher
+from networksecurity.pipeline.inference_pool import InferencePool, InferencePoolFullError
+from networksecurity.pipeline.url_scoring import BulkUrlScorer
+from networksecurity.utils.main_utils.payload_codec import (
+    INT8_CONTENT_TYPE,
+    decode_feature_payload,
+    encode_predictions,
+    get_feature_columns,
+)
+from networksecurity.utils.main_utils.mongo_client import close_mongo_client, ping_mongo
 
-database = client[DATA_INGESTION_DATABASE_NAME]
-collection = database[DATA_INGESTION_COLLECTION_NAME]
+from networksecurity.constant.training_pipeline import PREDICTION_BATCH_MAX_SIZE, PREDICTION_BATCH_MAX_WAIT_MS
+from networksecurity.constant.training_pipeline import PREDICTION_OUTPUT_COLUMN, URL_SCORING_DEGRADED_COLUMN
+from networksecurity.constant.training_pipeline import INFERENCE_POOL_MAX_WORKERS, INFERENCE_POOL_MAX_PENDING
+from networksecurity.constant.training_pipeline import FINAL_FEATURE_SUBSET_MANIFEST_FILE_PATH
 
 app = FastAPI()
 origins = ["*"]
@@ -47,42 +48,162 @@ app.add_middleware(
 from fastapi.templating import Jinja2Templates
 templates = Jinja2Templates(directory="./templates")
 
+model_cache = NetworkModelCache()
+training_job_runner = TrainingJobRunner()
+feature_columns = get_feature_columns()
+inference_pool = InferencePool(
+    max_workers=int(os.getenv("INFERENCE_POOL_MAX_WORKERS", INFERENCE_POOL_MAX_WORKERS)),
+    max_pending=int(os.getenv("INFERENCE_POOL_MAX_PENDING", INFERENCE_POOL_MAX_PENDING)),
+)
+prediction_batcher = PredictionBatcher(
+    predict_fn=inference_pool.predict,
+    max_batch_size=int(os.getenv("PREDICTION_BATCH_MAX_SIZE", PREDICTION_BATCH_MAX_SIZE)),
+    max_wait_ms=float(os.getenv("PREDICTION_BATCH_MAX_WAIT_MS", PREDICTION_BATCH_MAX_WAIT_MS)),
+)
+## one scorer for the process, its thread pools and HTTP session are shared by all requests
+url_scorer = BulkUrlScorer(feature_subset_file_path=FINAL_FEATURE_SUBSET_MANIFEST_FILE_PATH)
+## the cheaper feature subset model, used for /predict/urls once FeatureCostAnalysis published one
+subset_model_cache = NetworkModelCache(manifest_file_path=FINAL_FEATURE_SUBSET_MANIFEST_FILE_PATH)
+
+def url_predict_fn():
+    url_scorer.refresh_feature_subset()
+    if not url_scorer.uses_feature_subset:
+        return inference_pool.predict
+    subset_model_cache.start_watcher()
+    return subset_model_cache.predict
+
+@app.on_event("startup")
+async def load_model_cache():
+    try:
+        model_cache.refresh()
+    except Exception as e:
+        logging.warning(f"No model loaded at startup: {str(e)}")
+    model_cache.start_watcher()
+    await inference_pool.start()
+    await prediction_batcher.start()
+    url_scorer.start()
+
+@app.on_event("shutdown")
+async def stop_model_cache():
+    await prediction_batcher.stop()
+    url_scorer.shutdown()
+    subset_model_cache.stop_watcher()
+    inference_pool.shutdown()
+    model_cache.stop_watcher()
+    close_mongo_client()
+
 @app.get("/", tags=["authentication"])
 async def index():
     return RedirectResponse(url="/docs")
 
+@app.get("/health")
+async def health_route():
+    """
+    Liveness of the API with the state of MongoDB and the served model. Mongo being down
+    does not fail the check, prediction does not need it.
+    """
+    mongo_ok = await run_in_threadpool(ping_mongo)
+    return {"status": "ok", "mongo": "ok" if mongo_ok else "unavailable", "model_version": model_cache.version}
+
 @app.get("/train")
 async def train_route():
+    """
+    Start a background training run, or return the one already in progress
+    """
     try:
-        train_pipeline=TrainingPipeline()
-        train_pipeline.run_pipeline()
-        return Response("Training is successful")
+        job = training_job_runner.submit()
+        return {**job, "status_url": f"/train/{job['job_id']}"}
     except Exception as e:
         raise NetworkSecurityException(e,sys)
+
+@app.get("/train/{job_id}")
+async def train_status_route(job_id: str):
+    try:
+        status = training_job_runner.get_status(job_id)
+    except Exception as e:
+        raise NetworkSecurityException(e,sys)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Unknown training job {job_id}")
+    return status
     
 @app.post("/predict")
 async def predict_route(request: Request,file: UploadFile = File(...)):
     try:
-        df=pd.read_csv(file.file)
-        #print(df)
-        preprocesor=load_object("final_model/preprocessor.pkl")
-        final_model=load_object("final_model/model.pkl")
-        network_model = NetworkModel(preprocessor=preprocesor,model=final_model)
-        print(df.iloc[0])
-        y_pred = network_model.predict(df)
-        print(y_pred)
-        df['predicted_column'] = y_pred
-        print(df['predicted_column'])
-        #df['predicted_column'].replace(-1, 0)
-        #return df.to_json()
-        import os
-        os.makedirs("prediction_output", exist_ok=True)
-        df.to_csv('prediction_output/output.csv')
-        table_html = df.to_html(classes='table table-striped')
-        #print(table_html)
+        ## parsing, inference and rendering run in the inference pool, the loop only reads the upload
+        csv_bytes = await file.read()
+        table_html = await inference_pool.predict_csv_as_html(csv_bytes)
         from fastapi.responses import HTMLResponse
         return HTMLResponse(content=table_html)
-        
+    except InferencePoolFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+
+@app.post("/predict/stream")
+async def predict_stream_route(file: UploadFile = File(...), output_format: str = "csv"):
+    try:
+        if output_format not in ("csv", "ndjson"):
+            raise ValueError(f"Unsupported output_format: {output_format}, use csv or ndjson")
+        batch_prediction = BatchPrediction(network_model=model_cache.get_model())
+        ## the upload is closed once this handler returns, so hand the stream its own copy
+        upload_copy = tempfile.TemporaryFile()
+        await run_in_threadpool(shutil.copyfileobj, file.file, upload_copy)
+        upload_copy.seek(0)
+        if output_format == "ndjson":
+            return StreamingResponse(batch_prediction.stream_ndjson(upload_copy), media_type="application/x-ndjson")
+        return StreamingResponse(batch_prediction.stream_csv(upload_copy), media_type="text/csv")
+    except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+
+@app.post("/predict/binary")
+async def predict_binary_route(request: Request):
+    """
+    Score a raw .npy, Arrow IPC stream or packed int8 body with the schema's feature columns.
+    Predictions come back as int8 in the same format.
+    """
+    try:
+        content_type = request.headers.get("content-type", INT8_CONTENT_TYPE).split(";")[0].strip()
+        body = await request.body()
+        x = decode_feature_payload(body, content_type, feature_columns)
+        y_pred = await inference_pool.predict(x)
+        return Response(content=encode_predictions(y_pred, content_type), media_type=content_type)
+    except InferencePoolFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+
+@app.post("/predict/record")
+async def predict_record_route(record: Dict[str, float]):
+    """
+    Score one feature vector. Concurrent calls are batched into a single model call.
+    Features missing from the record are left for the imputer.
+    """
+    try:
+        row = [record.get(column, np.nan) for column in feature_columns]
+        y_pred = await prediction_batcher.predict(row)
+        return {PREDICTION_OUTPUT_COLUMN: int(y_pred)}
+    except InferencePoolFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
+
+@app.post("/predict/urls")
+async def predict_urls_route(file: UploadFile = File(...)):
+    """
+    Score a text file of URLs, one per line. Network probes for different URLs run concurrently
+    and each URL has a total deadline, features that missed it are listed per URL.
+    """
+    try:
+        content = (await file.read()).decode("utf-8")
+        urls = [line.strip() for line in content.splitlines() if line.strip()]
+        scored_df = await url_scorer.score(urls, predict_fn=url_predict_fn())
+        return scored_df[["url", PREDICTION_OUTPUT_COLUMN, URL_SCORING_DEGRADED_COLUMN]].to_dict(orient="records")
+    except InferencePoolFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
             raise NetworkSecurityException(e,sys)
 
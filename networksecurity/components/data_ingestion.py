@@ -5,28 +5,37 @@ import sys
 import numpy as np
 import pandas as pd
 import pymongo
-import certifi
+import shutil
+from collections import deque
+from datetime import timedelta
+from bson import ObjectId
 from typing import List
 from sklearn.model_selection import train_test_split
-from dotenv import load_dotenv
-load_dotenv()
-MONGO_DB_URL=os.getenv("MONGO_DB_URL")
-load_dotenv()
-MONGO_DB_URL = os.getenv("MONGODB_URL_KEY")
 
 ## configuration of the Data Ingestion Config
 
 from networksecurity.entity.config_entity import DataIngestionConfig
 from networksecurity.entity.artifact_entity import DataIngestionArtifact
+from networksecurity.utils.main_utils.utils import get_schema_columns,get_schema_dtype,get_missing_value,load_numpy_array_data,save_columnar_array
+from networksecurity.utils.main_utils.utils import read_yaml_file,write_yaml_file
+from networksecurity.utils.main_utils.packing import INT8_MISSING,PackedRowWriter,pack_int8_rows,unpack_int8_rows
+from networksecurity.utils.main_utils.mongo_client import get_mongo_client
 
 
 
 
 
 class DataIngestion:
-    def __init__(self,data_ingestion_config:DataIngestionConfig):
+    def __init__(self,data_ingestion_config:DataIngestionConfig,mongo_client=None):
+        """
+        mongo_client: client to read the collection with, e.g. mongomock.MongoClient() in
+        tests. By default the shared client of the process.
+        """
         try:
             self.data_ingestion_config=data_ingestion_config
+            if mongo_client is None:
+                mongo_client=get_mongo_client()
+            self.mongo_client=mongo_client
         except Exception as e:
             raise NetworkSecurityException(e,sys)
         
@@ -34,44 +43,143 @@ class DataIngestion:
 
     
         
-    def export_collection_as_dataframe(self):
+    @staticmethod
+    def convert_documents(documents: List[dict], columns: List[str]) -> np.ndarray:
+        """
+        Turn a batch of documents into an int8 (rows, columns) buffer, "na" and absent
+        fields become INT8_MISSING
+        """
+        frame = pd.DataFrame.from_records(documents, columns=columns)
+        ## one numeric conversion per column instead of one int() per cell
+        values = frame.mask(frame.eq("na")).apply(pd.to_numeric).to_numpy(dtype=np.float32)
+        return np.where(np.isnan(values), INT8_MISSING, values).astype(np.int8)
+
+    def read_watermark(self) -> dict:
+        """
+        Last ingested _id, the _ids ingested within the safety window before it and the row
+        count of the persistent feature store, empty when the store has to be built from scratch
+        """
+        watermark_file_path=self.data_ingestion_config.watermark_file_path
+        if not os.path.exists(watermark_file_path):
+            return {}
+        watermark=read_yaml_file(watermark_file_path) or {}
+        same_source=(watermark.get("database_name")==self.data_ingestion_config.database_name and
+                     watermark.get("collection_name")==self.data_ingestion_config.collection_name)
+        if not same_source:
+            logging.info("Watermark belongs to another collection, rebuilding the feature store")
+            return {}
+        return watermark
+
+    def write_watermark(self,last_id,row_count: int,window_ids: List[str]):
+        watermark_file_path=self.data_ingestion_config.watermark_file_path
+        temp_file_path=f"{watermark_file_path}.tmp"
+        write_yaml_file(temp_file_path,{
+            "database_name":self.data_ingestion_config.database_name,
+            "collection_name":self.data_ingestion_config.collection_name,
+            "last_id":str(last_id) if last_id is not None else None,
+            "row_count":row_count,
+            "window_ids":window_ids,
+        },replace=True)
+        os.replace(temp_file_path,watermark_file_path)
+
+    def export_collection_into_feature_store(self,full_refresh: bool=False) -> np.ndarray:
         """
-        Read data from mongodb
+        Append the documents inserted since the last run to the persistent packed feature
+        store, streaming them from mongodb batch by batch in _id order.
+
+        The watermark is the last ingested ObjectId and is written only after the rows are
+        on disk, so an interrupted run is cut back to the watermark and fetched again.
+        ObjectIds carry the time the client created them, not the commit order: a batch
+        of parallel unordered inserts can commit a document after one with a newer _id.
+        Each run therefore reads again from watermark_safety_window_seconds before the
+        watermark and skips the _ids the watermark records as ingested in that window.
+        Documents committed later than that with an older _id (restored backups, clients
+        with skewed clocks) need full_refresh.
+        return: the packed rows of the feature store
         """
         try:
             database_name=self.data_ingestion_config.database_name
             collection_name=self.data_ingestion_config.collection_name
-            self.mongo_client = pymongo.MongoClient(
-            MONGO_DB_URL,tlsCAFile=certifi.where())
+            persistent_file_path=self.data_ingestion_config.persistent_feature_store_file_path
+            batch_size=self.data_ingestion_config.export_batch_size
+            columns=get_schema_columns()
             collection=self.mongo_client[database_name][collection_name]
-            df=pd.DataFrame(list(collection.find()))
-            if "_id" in df.columns.to_list():
-                df=df.drop(columns=["_id"],axis=1)
-            
-            df.replace({"na":np.nan},inplace=True)
-            return df
-        except Exception as e:
-            raise NetworkSecurityException(e, sys)
 
-        
-    def export_data_into_feature_store(self,dataframe: pd.DataFrame):
-        try:
+            watermark={} if full_refresh else self.read_watermark()
+            if watermark and not os.path.exists(persistent_file_path):
+                logging.info(f"{persistent_file_path} is missing, rebuilding the feature store")
+                watermark={}
+            last_id=ObjectId(watermark["last_id"]) if watermark.get("last_id") else None
+            row_count=watermark.get("row_count",0)
+            safety_window=timedelta(seconds=self.data_ingestion_config.watermark_safety_window_seconds)
+            ingested_ids={ObjectId(object_id) for object_id in watermark.get("window_ids") or []}
+            query={}
+            if last_id is not None:
+                query={"_id":{"$gte":ObjectId.from_datetime(last_id.generation_time-safety_window)}}
+            ## only _id and the schema columns leave the server
+            projection={"_id":True,**{column:True for column in columns}}
+            cursor=collection.find(query,projection=projection,batch_size=batch_size).sort("_id",pymongo.ASCENDING)
+
+            if watermark:
+                writer=PackedRowWriter.open_for_append(persistent_file_path,row_count)
+            else:
+                writer=PackedRowWriter(persistent_file_path)
+            ## _ids read within the safety window of the newest one, in _id order
+            window_ids=deque()
+            with writer:
+                for documents in self._batches(cursor,batch_size):
+                    for document in documents:
+                        window_ids.append(document["_id"])
+                    last_id=documents[-1]["_id"]
+                    window_start=ObjectId.from_datetime(last_id.generation_time-safety_window)
+                    while window_ids[0]<window_start:
+                        window_ids.popleft()
+                    documents=[document for document in documents if document["_id"] not in ingested_ids]
+                    if not documents:
+                        continue
+                    packed,packable=pack_int8_rows(self.convert_documents(documents,columns))
+                    if not packable.all():
+                        raise ValueError(f"{int((~packable).sum())} documents hold values outside {{-1, 0, 1}}")
+                    writer.append(packed)
+            self.write_watermark(last_id,writer.number_of_rows,[str(object_id) for object_id in window_ids])
+            logging.info(f"Appended {writer.number_of_rows-row_count} new documents, "
+                         f"the feature store holds {writer.number_of_rows} rows")
+
+            ## the run's artifact keeps a snapshot of the store it was trained on
             feature_store_file_path=self.data_ingestion_config.feature_store_file_path
-            #creating folder
-            dir_path = os.path.dirname(feature_store_file_path)
-            os.makedirs(dir_path,exist_ok=True)
-            dataframe.to_csv(feature_store_file_path,index=False,header=True)
-            return dataframe
-            
+            os.makedirs(os.path.dirname(feature_store_file_path),exist_ok=True)
+            shutil.copyfile(persistent_file_path,feature_store_file_path)
+            return load_numpy_array_data(feature_store_file_path,mmap_mode="r")
         except Exception as e:
-            raise NetworkSecurityException(e,sys)
-        
-    def split_data_as_train_test(self,dataframe: pd.DataFrame):
+            raise NetworkSecurityException(e, sys)
+
+    @staticmethod
+    def _batches(cursor,batch_size: int):
+        batch=[]
+        for document in cursor:
+            batch.append(document)
+            if len(batch)>=batch_size:
+                yield batch
+                batch=[]
+        if batch:
+            yield batch
+
+    @staticmethod
+    def unpack_to_columnar(packed_rows: np.ndarray) -> np.ndarray:
+        """
+        Packed rows as a (rows, columns) array of the schema dtype
+        """
+        values=unpack_int8_rows(packed_rows,len(get_schema_columns()))
+        dtype=get_schema_dtype()
+        return np.where(values==INT8_MISSING,get_missing_value(dtype),values).astype(dtype)
+
+    def split_data_as_train_test(self,packed_rows: np.ndarray):
         try:
+            ## one uint64 per row, the split itself never unpacks the data
             train_set, test_set = train_test_split(
-                dataframe, test_size=self.data_ingestion_config.train_test_split_ratio
+                packed_rows, test_size=self.data_ingestion_config.train_test_split_ratio
             )
-            logging.info("Performed train test split on the dataframe")
+            logging.info("Performed train test split on the packed rows")
 
             logging.info(
                 "Exited split_data_as_train_test method of Data_Ingestion class"
@@ -83,13 +191,10 @@ class DataIngestion:
             
             logging.info(f"Exporting train and test file path.")
             
-            train_set.to_csv(
-                self.data_ingestion_config.training_file_path, index=False, header=True
-            )
+            ## the next stages open these memory-mapped, one contiguous int8 column after another
+            save_columnar_array(self.data_ingestion_config.training_file_path, self.unpack_to_columnar(train_set))
 
-            test_set.to_csv(
-                self.data_ingestion_config.testing_file_path, index=False, header=True
-            )
+            save_columnar_array(self.data_ingestion_config.testing_file_path, self.unpack_to_columnar(test_set))
             logging.info(f"Exported train and test file path.")
 
             
@@ -97,11 +202,10 @@ class DataIngestion:
             raise NetworkSecurityException(e,sys)
         
         
-    def initiate_data_ingestion(self):
+    def initiate_data_ingestion(self,full_refresh: bool=False):
         try:
-            dataframe=self.export_collection_as_dataframe()
-            dataframe=self.export_data_into_feature_store(dataframe)
-            self.split_data_as_train_test(dataframe)
+            packed_rows=self.export_collection_into_feature_store(full_refresh=full_refresh)
+            self.split_data_as_train_test(packed_rows)
             dataingestionartifact=DataIngestionArtifact(trained_file_path=self.data_ingestion_config.training_file_path,
                                                         test_file_path=self.data_ingestion_config.testing_file_path)
             return dataingestionartifact
@@ -7,6 +7,7 @@ from sklearn.pipeline import Pipeline
 
 from networksecurity.constant.training_pipeline import TARGET_COLUMN
 from networksecurity.constant.training_pipeline import DATA_TRANSFORMATION_IMPUTER_PARAMS
+from networksecurity.constant.training_pipeline import DATA_TRANSFORMATION_IMPUTER_BENCHMARK_BATCH_SIZES
 
 from networksecurity.entity.artifact_entity import (
     DataTransformationArtifact,
@@ -16,7 +17,8 @@ from networksecurity.entity.artifact_entity import (
 from networksecurity.entity.config_entity import DataTransformationConfig
 from networksecurity.exception.exception import NetworkSecurityException 
 from networksecurity.logging.logger import logging
-from networksecurity.utils.main_utils.utils import save_numpy_array_data,save_object
+from networksecurity.utils.main_utils.utils import save_numpy_array_data,save_object,load_columnar_dataframe,to_float_with_nan
+from networksecurity.utils.ml_utils.model.compact_imputer import CompactKNNImputer,benchmark_compact_imputer
 
 class DataTransformation:
     def __init__(self,data_validation_artifact:DataValidationArtifact,
@@ -30,14 +32,14 @@ class DataTransformation:
     @staticmethod
     def read_data(file_path) -> pd.DataFrame:
         try:
-            return pd.read_csv(file_path)
+            return load_columnar_dataframe(file_path)
         except Exception as e:
             raise NetworkSecurityException(e, sys)
         
     def get_data_transformer_object(cls)->Pipeline:
         """
-        It initialises a KNNImputer object with the parameters specified in the training_pipeline.py file
-        and returns a Pipeline object with the KNNImputer object as the first step.
+        It initialises a CompactKNNImputer object with the parameters specified in the training_pipeline.py file
+        and returns a Pipeline object with the CompactKNNImputer object as the first step.
 
         Args:
           cls: DataTransformation
@@ -49,16 +51,37 @@ class DataTransformation:
             "Entered get_data_trnasformer_object method of Trnasformation class"
         )
         try:
-           imputer:KNNImputer=KNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS)
+           imputer:CompactKNNImputer=CompactKNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS)
            logging.info(
-                f"Initialise KNNImputer with {DATA_TRANSFORMATION_IMPUTER_PARAMS}"
+                f"Initialise CompactKNNImputer with {DATA_TRANSFORMATION_IMPUTER_PARAMS}"
             )
            processor:Pipeline=Pipeline([("imputer",imputer)])
            return processor
         except Exception as e:
             raise NetworkSecurityException(e,sys)
 
-        
+    @staticmethod
+    def log_imputer_benchmark(input_feature_train_df,input_feature_test_df,compact_imputer):
+        """
+        Time the compact imputer against a KNNImputer holding the full training matrix.
+        Serving only imputes incomplete rows, test rows get one feature blanked to stand in for them.
+        """
+        try:
+            full_imputer=KNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS).fit(input_feature_train_df)
+            rng=np.random.default_rng(0)
+            incomplete_rows=input_feature_test_df.to_numpy(dtype=float)[:max(DATA_TRANSFORMATION_IMPUTER_BENCHMARK_BATCH_SIZES)].copy()
+            incomplete_rows[np.arange(len(incomplete_rows)),rng.integers(0,incomplete_rows.shape[1],len(incomplete_rows))]=np.nan
+            report=benchmark_compact_imputer(full_imputer,compact_imputer,incomplete_rows,
+                                             batch_sizes=DATA_TRANSFORMATION_IMPUTER_BENCHMARK_BATCH_SIZES)
+            logging.info(f"Imputer reference: full {report['full_reference_bytes']} bytes, "
+                         f"compact {report['compact_reference_bytes']} bytes")
+            for batch_size in DATA_TRANSFORMATION_IMPUTER_BENCHMARK_BATCH_SIZES:
+                timings=report[batch_size]
+                logging.info(f"Imputing {batch_size} incomplete rows: full {timings['full_ms']:.3f}ms, "
+                             f"compact {timings['compact_ms']:.3f}ms ({timings['speedup']:.1f}x)")
+        except Exception as e:
+            logging.warning(f"Imputer benchmark failed: {str(e)}")
+
     def initiate_data_transformation(self)->DataTransformationArtifact:
         logging.info("Entered initiate_data_transformation method of DataTransformation class")
         try:
@@ -66,33 +89,36 @@ class DataTransformation:
             train_df=DataTransformation.read_data(self.data_validation_artifact.valid_train_file_path)
             test_df=DataTransformation.read_data(self.data_validation_artifact.valid_test_file_path)
 
-            ## training dataframe
-            input_feature_train_df=train_df.drop(columns=[TARGET_COLUMN],axis=1)
+            ## training dataframe, the imputer needs float features with NaN for missing values
+            input_feature_train_df=to_float_with_nan(train_df.drop(columns=[TARGET_COLUMN],axis=1))
             target_feature_train_df = train_df[TARGET_COLUMN]
             target_feature_train_df = target_feature_train_df.replace(-1, 0)
 
             #testing dataframe
-            input_feature_test_df = test_df.drop(columns=[TARGET_COLUMN], axis=1)
+            input_feature_test_df = to_float_with_nan(test_df.drop(columns=[TARGET_COLUMN], axis=1))
             target_feature_test_df = test_df[TARGET_COLUMN]
             target_feature_test_df = target_feature_test_df.replace(-1, 0)
 
             preprocessor=self.get_data_transformer_object()
 
+            ## the imputer keeps each distinct row once with its count, neighbours are still
+            ## taken with their multiplicity like a KNNImputer fitted on every row
             preprocessor_object=preprocessor.fit(input_feature_train_df)
+            logging.info(f"Imputer reference set: {len(preprocessor_object['imputer'].reference_)} distinct rows "
+                         f"out of {len(input_feature_train_df)}")
+            self.log_imputer_benchmark(input_feature_train_df,input_feature_test_df,preprocessor_object["imputer"])
             transformed_input_train_feature=preprocessor_object.transform(input_feature_train_df)
             transformed_input_test_feature =preprocessor_object.transform(input_feature_test_df)
              
 
-            train_arr = np.c_[transformed_input_train_feature, np.array(target_feature_train_df) ]
-            test_arr = np.c_[ transformed_input_test_feature, np.array(target_feature_test_df) ]
+            train_arr = np.column_stack([transformed_input_train_feature, np.array(target_feature_train_df)]).astype(np.float32)
+            test_arr = np.column_stack([transformed_input_test_feature, np.array(target_feature_test_df)]).astype(np.float32)
 
-            #save numpy array data
+            #save numpy array data as float32, the trainer maps it read-only instead of loading it
             save_numpy_array_data( self.data_transformation_config.transformed_train_file_path, array=train_arr, )
             save_numpy_array_data( self.data_transformation_config.transformed_test_file_path,array=test_arr,)
             save_object( self.data_transformation_config.transformed_object_file_path, preprocessor_object,)
 
-            save_object( "final_model/preprocessor.pkl", preprocessor_object,)
-
 
             #preparing artifacts
 
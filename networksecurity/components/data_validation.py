@@ -7,6 +7,8 @@ from scipy.stats import ks_2samp
 import pandas as pd
 import os,sys
 from networksecurity.utils.main_utils.utils import read_yaml_file,write_yaml_file
+from networksecurity.utils.main_utils.utils import load_columnar_dataframe,get_missing_value
+import shutil
 
 class DataValidation:
     def __init__(self,data_ingestion_artifact:DataIngestionArtifact,
@@ -22,7 +24,7 @@ class DataValidation:
     @staticmethod
     def read_data(file_path)->pd.DataFrame:
         try:
-            return pd.read_csv(file_path)
+            return load_columnar_dataframe(file_path)
         except Exception as e:
             raise NetworkSecurityException(e,sys)
         
@@ -42,8 +44,10 @@ class DataValidation:
             status=True
             report={}
             for column in base_df.columns:
-                d1=base_df[column]
-                d2=current_df[column]
+                ## missing values are stored as a stand-in value, keep them out of the distributions
+                missing_value=get_missing_value(base_df[column].dtype)
+                d1=base_df[column][base_df[column]!=missing_value]
+                d2=current_df[column][current_df[column]!=missing_value]
                 is_same_dist=ks_2samp(d1,d2)
                 if threshold<=is_same_dist.pvalue:
                     is_found=False
@@ -89,19 +93,15 @@ class DataValidation:
             dir_path=os.path.dirname(self.data_validation_config.valid_train_file_path)
             os.makedirs(dir_path,exist_ok=True)
 
-            train_dataframe.to_csv(
-                self.data_validation_config.valid_train_file_path, index=False, header=True
+            ## validation does not change the data, the validated artifacts are byte copies
+            shutil.copyfile(train_file_path, self.data_validation_config.valid_train_file_path)
 
-            )
-
-            test_dataframe.to_csv(
-                self.data_validation_config.valid_test_file_path, index=False, header=True
-            )
+            shutil.copyfile(test_file_path, self.data_validation_config.valid_test_file_path)
             
             data_validation_artifact = DataValidationArtifact(
                 validation_status=status,
-                valid_train_file_path=self.data_ingestion_artifact.trained_file_path,
-                valid_test_file_path=self.data_ingestion_artifact.test_file_path,
+                valid_train_file_path=self.data_validation_config.valid_train_file_path,
+                valid_test_file_path=self.data_validation_config.valid_test_file_path,
                 invalid_train_file_path=None,
                 invalid_test_file_path=None,
                 drift_report_file_path=self.data_validation_config.drift_report_file_path,
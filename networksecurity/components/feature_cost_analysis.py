@@ -0,0 +1,200 @@
+import copy
+import sys
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sklearn.pipeline import Pipeline
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+from networksecurity.components.model_trainer import ModelTrainer
+from networksecurity.constant.training_pipeline import DATA_TRANSFORMATION_IMPUTER_PARAMS
+from networksecurity.entity.artifact_entity import DataTransformationArtifact, FeatureCostAnalysisArtifact
+from networksecurity.entity.config_entity import FeatureCostAnalysisConfig
+from networksecurity.utils.main_utils.extraction_benchmark import benchmark_feature_extraction
+from networksecurity.utils.main_utils.feature_extraction import (
+    DOMAIN_FEATURES,
+    LEXICAL_FEATURES,
+    PROBE_GROUPS,
+    UNAVAILABLE_FEATURES,
+)
+from networksecurity.utils.main_utils.feature_transport import FixtureStore
+from networksecurity.utils.main_utils.payload_codec import get_feature_columns
+from networksecurity.utils.main_utils.utils import load_numpy_array_data, save_object, write_yaml_file
+from networksecurity.utils.ml_utils.model.compact_imputer import CompactKNNImputer
+from networksecurity.utils.ml_utils.model.estimator import NetworkModel
+from networksecurity.utils.ml_utils.model.model_manifest import publish_model_pair
+
+LEXICAL_GROUP = "lexical"
+## probes a group waits for before its own features run
+PROBE_TIMINGS = {
+    LEXICAL_GROUP: [],
+    "page": ["probe:fetch", "probe:scan"],
+    "whois": ["probe:whois"],
+    "dns": ["probe:dns"],
+    "tls": ["probe:dns"],
+}
+
+
+def group_features(group: str) -> List[str]:
+    if group == LEXICAL_GROUP:
+        names = list(LEXICAL_FEATURES) + [fn.__name__ for fn in DOMAIN_FEATURES]
+        return [name for name in names if name not in UNAVAILABLE_FEATURES]
+    return [fn.__name__ for fn in PROBE_GROUPS[group]]
+
+
+class FeatureCostAnalysis:
+    """
+    Trains candidate models on feature subsets grouped by the probe they need and picks
+    the most accurate one that extracts within the latency budget.
+
+    Lexical features are always included, the placeholder features are never included
+    and Statistical_report only when every probe group is, since it counts all of them.
+    Probe groups run concurrently at serving time, so a subset costs its lexical
+    features plus its slowest probe group. The chosen model is published to final_model
+    together with its features and probe groups, so BulkUrlScorer can extract only those.
+    """
+    def __init__(self, feature_cost_analysis_config: FeatureCostAnalysisConfig,
+                 data_transformation_artifact: DataTransformationArtifact,
+                 model_trainer: ModelTrainer):
+        try:
+            self.feature_cost_analysis_config = feature_cost_analysis_config
+            self.data_transformation_artifact = data_transformation_artifact
+            self.model_trainer = model_trainer
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    @staticmethod
+    def measure_group_costs(fixture_store: FixtureStore,
+                            latency_seconds: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """
+        Milliseconds per URL of each feature group, replayed from recorded fixtures
+        """
+        try:
+            per_feature = benchmark_feature_extraction(fixture_store, latency_seconds=latency_seconds)["per_feature"]
+            group_costs_ms = {}
+            for group, probe_timings in PROBE_TIMINGS.items():
+                seconds = sum(per_feature.get(name, 0.0) for name in probe_timings + group_features(group))
+                group_costs_ms[group] = seconds * 1000
+            logging.info(f"Measured feature group costs in ms per URL: {group_costs_ms}")
+            return group_costs_ms
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    @staticmethod
+    def candidate_subsets() -> List[Tuple[str, ...]]:
+        probe_groups = list(PROBE_GROUPS)
+        return [subset for size in range(len(probe_groups) + 1) for subset in combinations(probe_groups, size)]
+
+    @staticmethod
+    def subset_features(probe_groups: Tuple[str, ...]) -> List[str]:
+        """
+        Feature columns a subset uses, in schema order
+        """
+        selected = set(group_features(LEXICAL_GROUP))
+        for group in probe_groups:
+            selected.update(group_features(group))
+        if len(probe_groups) == len(PROBE_GROUPS):
+            selected.add("Statistical_report")
+        return [column for column in get_feature_columns() if column in selected]
+
+    @staticmethod
+    def subset_latency_ms(probe_groups: Tuple[str, ...], group_costs_ms: Dict[str, float]) -> float:
+        return group_costs_ms[LEXICAL_GROUP] + max((group_costs_ms[group] for group in probe_groups), default=0.0)
+
+    @staticmethod
+    def pareto_front(candidates: List[dict]) -> List[dict]:
+        """
+        Candidates no other candidate beats on both latency and F1, fastest first
+        """
+        front = []
+        for candidate in sorted(candidates, key=lambda c: (c["latency_ms"], -c["f1_score"])):
+            if not front or candidate["f1_score"] > front[-1]["f1_score"]:
+                front.append(candidate)
+        return front
+
+    def initiate_feature_cost_analysis(self, fixture_store: Optional[FixtureStore] = None,
+                                       group_costs_ms: Optional[Dict[str, float]] = None) -> FeatureCostAnalysisArtifact:
+        """
+        fixture_store: recorded probes to measure the group costs from
+        group_costs_ms: measured costs to use instead, keyed by group name
+        """
+        try:
+            if group_costs_ms is None:
+                if fixture_store is None:
+                    raise ValueError("Either a fixture store or measured group costs are required")
+                group_costs_ms = self.measure_group_costs(fixture_store)
+
+            train_arr = load_numpy_array_data(self.data_transformation_artifact.transformed_train_file_path, mmap_mode="r")
+            test_arr = load_numpy_array_data(self.data_transformation_artifact.transformed_test_file_path, mmap_mode="r")
+            feature_columns = get_feature_columns()
+
+            candidates = []
+            models = {}
+            for probe_groups in self.candidate_subsets():
+                features = self.subset_features(probe_groups)
+                indices = [feature_columns.index(feature) for feature in features]
+                model, test_metric = self.model_trainer.train_candidate_model(
+                    train_arr[:, indices], train_arr[:, -1], test_arr[:, indices], test_arr[:, -1])
+                candidate = {
+                    "probe_groups": list(probe_groups),
+                    "features": features,
+                    "latency_ms": float(self.subset_latency_ms(probe_groups, group_costs_ms)),
+                    "f1_score": float(test_metric.f1_score),
+                    "precision_score": float(test_metric.precision_score),
+                    "recall_score": float(test_metric.recall_score),
+                }
+                logging.info(f"Feature subset {probe_groups}: f1 {candidate['f1_score']:.4f}, "
+                             f"{candidate['latency_ms']:.1f}ms per URL")
+                candidates.append(candidate)
+                models[probe_groups] = (model, test_metric)
+
+            front = self.pareto_front(candidates)
+            budget_ms = self.feature_cost_analysis_config.latency_budget_ms
+            affordable = [candidate for candidate in front if candidate["latency_ms"] <= budget_ms]
+            ## the front is sorted by latency with rising F1, so its last affordable point is the best one
+            chosen = affordable[-1] if affordable else front[0]
+            if not affordable:
+                logging.warning(f"No feature subset fits {budget_ms}ms per URL, choosing the cheapest one")
+            model, test_metric = models[tuple(chosen["probe_groups"])]
+
+            ## the subset model imputes only its own columns at serving time, fitting on named
+            ## columns lets NetworkModel select them from a wider frame
+            indices = [feature_columns.index(feature) for feature in chosen["features"]]
+            preprocessor = Pipeline([("imputer", CompactKNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS))])
+            preprocessor.fit(pd.DataFrame(train_arr[:, indices], columns=chosen["features"]))
+            save_object(self.feature_cost_analysis_config.subset_model_file_path,
+                        NetworkModel(preprocessor=preprocessor, model=model))
+            publish_model_pair(preprocessor, model,
+                               manifest_file_path=self.feature_cost_analysis_config.final_feature_subset_file_path,
+                               metadata={
+                                   "features": chosen["features"],
+                                   "probe_groups": chosen["probe_groups"],
+                                   "latency_ms": chosen["latency_ms"],
+                                   "f1_score": chosen["f1_score"],
+                               })
+            write_yaml_file(self.feature_cost_analysis_config.feature_subset_file_path, {
+                "latency_budget_ms": budget_ms,
+                "group_costs_ms": {group: float(cost) for group, cost in group_costs_ms.items()},
+                ## copies keep yaml from writing the shared entries as anchors and aliases
+                "chosen": copy.deepcopy(chosen),
+                "pareto_front": copy.deepcopy(front),
+                "candidates": candidates,
+            }, replace=True)
+
+            feature_cost_analysis_artifact = FeatureCostAnalysisArtifact(
+                feature_subset_file_path=self.feature_cost_analysis_config.feature_subset_file_path,
+                subset_model_file_path=self.feature_cost_analysis_config.subset_model_file_path,
+                final_feature_subset_file_path=self.feature_cost_analysis_config.final_feature_subset_file_path,
+                selected_features=chosen["features"],
+                latency_ms=chosen["latency_ms"],
+                test_metric_artifact=test_metric,
+            )
+            logging.info(f"Feature cost analysis artifact: {feature_cost_analysis_artifact}")
+            return feature_cost_analysis_artifact
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
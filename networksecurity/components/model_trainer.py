@@ -6,10 +6,13 @@ from networksecurity.logging.logger import logging
 
 from networksecurity.entity.artifact_entity import DataTransformationArtifact,ModelTrainerArtifact
 from networksecurity.entity.config_entity import ModelTrainerConfig
+from networksecurity.constant.training_pipeline import MODEL_SERVING_BATCH_SIZES,MODEL_SERVING_MIN_SPEEDUP
 
 
 
 from networksecurity.utils.ml_utils.model.estimator import NetworkModel
+from networksecurity.utils.ml_utils.model.model_manifest import publish_model_pair
+from networksecurity.utils.ml_utils.model.tree_ensemble import compile_tree_ensemble,calibrate_sklearn_crossover,benchmark_compiled_model
 from networksecurity.utils.main_utils.utils import save_object,load_object
 from networksecurity.utils.main_utils.utils import load_numpy_array_data,evaluate_models
 from networksecurity.utils.ml_utils.metric.classification_metric import get_classification_score
@@ -75,6 +78,43 @@ class ModelTrainer:
 
 
         
+    def export_serving_model(self,best_model,x_test):
+        """
+        Swap a tree ensemble for its compiled array form when it predicts identically on the
+        test set and is faster at every batch size serving scores. Batches past the measured
+        crossover are handed back to the sklearn model inside it.
+        """
+        try:
+            compiled_model=compile_tree_ensemble(best_model,x_test)
+            if compiled_model is None:
+                return best_model
+            compiled_model=calibrate_sklearn_crossover(best_model,compiled_model,x_test)
+            benchmark_report=benchmark_compiled_model(best_model,compiled_model,x_test,batch_sizes=MODEL_SERVING_BATCH_SIZES)
+            for batch_size,timings in benchmark_report.items():
+                logging.info(f"Batch of {batch_size} rows: sklearn {timings['sklearn_ms']:.3f}ms, "
+                             f"compiled {timings['compiled_ms']:.3f}ms ({timings['speedup']:.1f}x)")
+            slower=[batch_size for batch_size,timings in benchmark_report.items() if timings['speedup']<MODEL_SERVING_MIN_SPEEDUP]
+            if slower:
+                logging.info(f"Serving the sklearn model, the compiled one is slower on batches of {slower} rows")
+                return best_model
+            return compiled_model
+        except Exception as e:
+            logging.warning(f"Serving the sklearn model, compiling failed: {str(e)}")
+            return best_model
+
+    def train_candidate_model(self,x_train,y_train,x_test,y_test,model=None):
+        """
+        Fit one model without the hyperparameter search, used to compare feature subsets
+        return: (fitted model, test ClassificationMetricArtifact)
+        """
+        try:
+            model=model if model is not None else RandomForestClassifier(n_estimators=128,n_jobs=-1,random_state=42)
+            model.fit(x_train,y_train)
+            y_test_pred=model.predict(x_test)
+            return model,get_classification_score(y_true=y_test,y_pred=y_test_pred)
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
     def train_model(self,X_train,y_train,x_test,y_test):
         models = {
                 "Random Forest": RandomForestClassifier(verbose=1),
@@ -142,8 +182,9 @@ class ModelTrainer:
 
         Network_Model=NetworkModel(preprocessor=preprocessor,model=best_model)
         save_object(self.model_trainer_config.trained_model_file_path,obj=NetworkModel)
-        #model pusher
-        save_object("final_model/model.pkl",best_model)
+        #model pusher, publish the preprocessor and model together so serving picks up a matching pair
+        served_model=self.export_serving_model(best_model,x_test)
+        publish_model_pair(preprocessor,served_model)
         
 
         ## Model Trainer Artifact
@@ -167,9 +208,9 @@ class ModelTrainer:
             train_file_path = self.data_transformation_artifact.transformed_train_file_path
             test_file_path = self.data_transformation_artifact.transformed_test_file_path
 
-            #loading training array and testing array
-            train_arr = load_numpy_array_data(train_file_path)
-            test_arr = load_numpy_array_data(test_file_path)
+            #loading training array and testing array, memory-mapped
+            train_arr = load_numpy_array_data(train_file_path, mmap_mode="r")
+            test_arr = load_numpy_array_data(test_file_path, mmap_mode="r")
 
             x_train, y_train, x_test, y_test = (
                 train_arr[:, :-1],
@@ -9,10 +9,12 @@ defining common constant variable for training pipeline
 TARGET_COLUMN = "Result"
 PIPELINE_NAME: str = "NetworkSecurity"
 ARTIFACT_DIR: str = "Artifacts"
-FILE_NAME: str = "phisingData.csv"
+## the feature store is packed, one uint64 per row (see utils.main_utils.packing); the train/test
+## artifacts are columnar .npy files in the schema dtypes, opened memory-mapped by the next stage
+FILE_NAME: str = "phisingData.npy"
 
-TRAIN_FILE_NAME: str = "train.csv"
-TEST_FILE_NAME: str = "test.csv"
+TRAIN_FILE_NAME: str = "train.npy"
+TEST_FILE_NAME: str = "test.npy"
 
 SCHEMA_FILE_PATH = os.path.join("data_schema", "schema.yaml")
 
@@ -31,6 +33,13 @@ DATA_INGESTION_DIR_NAME: str = "data_ingestion"
 DATA_INGESTION_FEATURE_STORE_DIR: str = "feature_store"
 DATA_INGESTION_INGESTED_DIR: str = "ingested"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATION: float = 0.2
+DATA_INGESTION_EXPORT_BATCH_SIZE: int = 10000
+## kept outside the timestamped artifact dirs, each run only appends documents newer than the watermark
+DATA_INGESTION_PERSISTENT_FEATURE_STORE_DIR: str = "feature_store"
+DATA_INGESTION_WATERMARK_FILE_NAME: str = "watermark.yaml"
+## documents are fetched again from this many seconds before the watermark, parallel unordered
+## inserts can commit a document after others with a newer _id
+DATA_INGESTION_WATERMARK_SAFETY_WINDOW_SECONDS: int = 120
 
 """
 Data Validation related constant start with DATA_VALIDATION VAR NAME
@@ -55,6 +64,8 @@ DATA_TRANSFORMATION_IMPUTER_PARAMS: dict = {
     "n_neighbors": 3,
     "weights": "uniform",
 }
+## batch sizes of incomplete rows the compact imputer is timed at against the full reference
+DATA_TRANSFORMATION_IMPUTER_BENCHMARK_BATCH_SIZES: tuple = (1, 100, 1000)
 DATA_TRANSFORMATION_TRAIN_FILE_PATH: str = "train.npy"
 
 DATA_TRANSFORMATION_TEST_FILE_PATH: str = "test.npy"
@@ -70,4 +81,73 @@ MODEL_TRAINER_TRAINED_MODEL_NAME: str = "model.pkl"
 MODEL_TRAINER_EXPECTED_SCORE: float = 0.6
 MODEL_TRAINER_OVER_FIITING_UNDER_FITTING_THRESHOLD: float = 0.05
 
-TRAINING_BUCKET_NAME = "shivambucketnetwork"
\ No newline at end of file
+"""
+Feature cost analysis related constant start with FEATURE_COST_ANALYSIS VAR NAME
+"""
+FEATURE_COST_ANALYSIS_DIR_NAME: str = "feature_cost_analysis"
+FEATURE_COST_ANALYSIS_SUBSET_FILE_NAME: str = "feature_subset.yaml"
+FEATURE_COST_ANALYSIS_MODEL_FILE_NAME: str = "model.pkl"
+FEATURE_COST_ANALYSIS_LATENCY_BUDGET_MS: float = 1000.0
+## probe answers recorded by extraction_benchmark record, the analysis is skipped without them
+FEATURE_COST_ANALYSIS_FIXTURE_FILE_PATH: str = os.path.join("Network_Data", "probe_fixtures.json.gz")
+
+TRAINING_BUCKET_NAME = "shivambucketnetwork"
+
+"""
+Model serving related constant start with MODEL_SERVING VAR NAME
+"""
+FINAL_MODEL_DIR: str = "final_model"
+FINAL_MODEL_FILE_PATH: str = os.path.join(FINAL_MODEL_DIR, MODEL_FILE_NAME)
+FINAL_PREPROCESSOR_FILE_PATH: str = os.path.join(FINAL_MODEL_DIR, "preprocessor.pkl")
+## a retrain writes the pair into its own directory under versions/ and then replaces the
+## manifest in one rename, serving reads both paths from the manifest
+FINAL_MODEL_MANIFEST_FILE_PATH: str = os.path.join(FINAL_MODEL_DIR, "manifest.yaml")
+FINAL_MODEL_VERSIONS_DIR_NAME: str = "versions"
+FINAL_MODEL_KEEP_VERSIONS: int = 3
+## the feature subset model chosen by FeatureCostAnalysis, published the same way
+FINAL_FEATURE_SUBSET_MANIFEST_FILE_PATH: str = os.path.join(FINAL_MODEL_DIR, "feature_subset.yaml")
+MODEL_SERVING_RELOAD_INTERVAL_SECONDS: float = 5.0
+PREDICTION_OUTPUT_COLUMN: str = "predicted_column"
+PREDICTION_CHUNK_SIZE: int = 10000
+PREDICTION_BATCH_MAX_SIZE: int = 64
+PREDICTION_BATCH_MAX_WAIT_MS: float = 5.0
+INFERENCE_POOL_MAX_WORKERS: int = 2
+INFERENCE_POOL_MAX_PENDING: int = 32
+PREDICTION_CACHE_MAX_SIZE: int = 100000
+## batch sizes the compiled model has to win at: one record, a small batch and a bulk scoring
+## job. They bracket what serving scores, from a micro-batch up to a stream or binary chunk.
+MODEL_SERVING_BATCH_SIZES: tuple = (1, 100, 100_000)
+## below this the compiled model counts as slower; batches it hands back to sklearn run at
+## sklearn's speed, so timer noise alone must not reject it
+MODEL_SERVING_MIN_SPEEDUP: float = 0.95
+
+"""
+Training job related constant start with TRAINING_JOB VAR NAME
+"""
+TRAINING_JOB_DIR: str = os.path.join(ARTIFACT_DIR, "training_jobs")
+TRAINING_JOB_LOCK_FILE_NAME: str = "training.lock"
+TRAINING_JOB_CURRENT_FILE_NAME: str = "current_job.txt"
+
+"""
+URL scoring related constant start with URL_SCORING VAR NAME
+"""
+URL_SCORING_MAX_CONCURRENCY: int = 64
+URL_SCORING_PER_HOST_LIMIT: int = 4
+URL_SCORING_BATCH_SIZE: int = 256
+URL_SCORING_DEADLINE_SECONDS: float = 8.0
+URL_SCORING_DEGRADED_COLUMN: str = "degraded_features"
+
+"""
+MongoDB client related constant start with MONGO_CLIENT VAR NAME
+"""
+MONGO_CLIENT_MAX_POOL_SIZE: int = 50
+MONGO_CLIENT_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+MONGO_CLIENT_CONNECT_TIMEOUT_MS: int = 5000
+
+"""
+Feature extraction cache related constant start with WHOIS_CACHE VAR NAME
+"""
+FEATURE_CACHE_DIR: str = "feature_cache"
+WHOIS_CACHE_FILE_PATH: str = os.path.join(FEATURE_CACHE_DIR, "whois.sqlite3")
+WHOIS_CACHE_TTL_SECONDS: float = 7 * 24 * 60 * 60
+WHOIS_CACHE_NEGATIVE_TTL_SECONDS: float = 60 * 60
\ No newline at end of file
@@ -31,3 +31,12 @@ class ModelTrainerArtifact:
     trained_model_file_path: str
     train_metric_artifact: ClassificationMetricArtifact
     test_metric_artifact: ClassificationMetricArtifact
+
+@dataclass
+class FeatureCostAnalysisArtifact:
+    feature_subset_file_path: str
+    subset_model_file_path: str
+    final_feature_subset_file_path: str
+    selected_features: list
+    latency_ms: float
+    test_metric_artifact: ClassificationMetricArtifact
@@ -34,6 +34,14 @@ class DataIngestionConfig:
         self.train_test_split_ratio: float = training_pipeline.DATA_INGESTION_TRAIN_TEST_SPLIT_RATION
         self.collection_name: str = training_pipeline.DATA_INGESTION_COLLECTION_NAME
         self.database_name: str = training_pipeline.DATA_INGESTION_DATABASE_NAME
+        self.export_batch_size: int = training_pipeline.DATA_INGESTION_EXPORT_BATCH_SIZE
+        self.persistent_feature_store_file_path: str = os.path.join(
+                training_pipeline.DATA_INGESTION_PERSISTENT_FEATURE_STORE_DIR, training_pipeline.FILE_NAME
+            )
+        self.watermark_file_path: str = os.path.join(
+                training_pipeline.DATA_INGESTION_PERSISTENT_FEATURE_STORE_DIR, training_pipeline.DATA_INGESTION_WATERMARK_FILE_NAME
+            )
+        self.watermark_safety_window_seconds: int = training_pipeline.DATA_INGESTION_WATERMARK_SAFETY_WINDOW_SECONDS
 
 class DataValidationConfig:
     def __init__(self,training_pipeline_config:TrainingPipelineConfig):
@@ -55,9 +63,9 @@ class DataTransformationConfig:
      def __init__(self,training_pipeline_config:TrainingPipelineConfig):
         self.data_transformation_dir: str = os.path.join( training_pipeline_config.artifact_dir,training_pipeline.DATA_TRANSFORMATION_DIR_NAME )
         self.transformed_train_file_path: str = os.path.join( self.data_transformation_dir,training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
-            training_pipeline.TRAIN_FILE_NAME.replace("csv", "npy"),)
+            training_pipeline.TRAIN_FILE_NAME,)
         self.transformed_test_file_path: str = os.path.join(self.data_transformation_dir,  training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
-            training_pipeline.TEST_FILE_NAME.replace("csv", "npy"), )
+            training_pipeline.TEST_FILE_NAME, )
         self.transformed_object_file_path: str = os.path.join( self.data_transformation_dir, training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR,
             training_pipeline.PREPROCESSING_OBJECT_FILE_NAME,)
         
@@ -71,4 +79,20 @@ class ModelTrainerConfig:
             training_pipeline.MODEL_FILE_NAME
         )
         self.expected_accuracy: float = training_pipeline.MODEL_TRAINER_EXPECTED_SCORE
-        self.overfitting_underfitting_threshold = training_pipeline.MODEL_TRAINER_OVER_FIITING_UNDER_FITTING_THRESHOLD
\ No newline at end of file
+        self.overfitting_underfitting_threshold = training_pipeline.MODEL_TRAINER_OVER_FIITING_UNDER_FITTING_THRESHOLD
+
+
+class FeatureCostAnalysisConfig:
+    def __init__(self,training_pipeline_config:TrainingPipelineConfig):
+        self.feature_cost_analysis_dir: str = os.path.join(
+            training_pipeline_config.artifact_dir, training_pipeline.FEATURE_COST_ANALYSIS_DIR_NAME
+        )
+        self.feature_subset_file_path: str = os.path.join(
+            self.feature_cost_analysis_dir, training_pipeline.FEATURE_COST_ANALYSIS_SUBSET_FILE_NAME
+        )
+        self.subset_model_file_path: str = os.path.join(
+            self.feature_cost_analysis_dir, training_pipeline.FEATURE_COST_ANALYSIS_MODEL_FILE_NAME
+        )
+        self.latency_budget_ms: float = training_pipeline.FEATURE_COST_ANALYSIS_LATENCY_BUDGET_MS
+        self.fixture_file_path: str = training_pipeline.FEATURE_COST_ANALYSIS_FIXTURE_FILE_PATH
+        self.final_feature_subset_file_path: str = training_pipeline.FINAL_FEATURE_SUBSET_MANIFEST_FILE_PATH
@@ -0,0 +1,52 @@
+import sys
+from typing import IO, Iterator
+
+import pandas as pd
+
+from networksecurity.constant.training_pipeline import PREDICTION_CHUNK_SIZE, PREDICTION_OUTPUT_COLUMN
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.ml_utils.model.estimator import NetworkModel
+
+
+class BatchPrediction:
+    """
+    Scores a CSV upload chunk by chunk so memory stays flat for large files and
+    the first rows can be sent back while the rest is still being parsed.
+    """
+    def __init__(self, network_model: NetworkModel, chunk_size: int = PREDICTION_CHUNK_SIZE):
+        try:
+            self.network_model = network_model
+            self.chunk_size = chunk_size
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def predict_in_chunks(self, file_obj: IO) -> Iterator[pd.DataFrame]:
+        """
+        Yield each chunk of the CSV with the prediction column added.
+        The file object is closed once the chunks are exhausted.
+        """
+        try:
+            number_of_rows = 0
+            for chunk in pd.read_csv(file_obj, chunksize=self.chunk_size):
+                chunk[PREDICTION_OUTPUT_COLUMN] = self.network_model.predict(chunk)
+                number_of_rows += len(chunk)
+                yield chunk
+            logging.info(f"Streamed predictions for {number_of_rows} rows")
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+        finally:
+            file_obj.close()
+
+    def stream_csv(self, file_obj: IO) -> Iterator[str]:
+        header = True
+        for chunk in self.predict_in_chunks(file_obj):
+            yield chunk.to_csv(index=False, header=header)
+            header = False
+
+    def stream_ndjson(self, file_obj: IO) -> Iterator[str]:
+        for chunk in self.predict_in_chunks(file_obj):
+            lines = chunk.to_json(orient="records", lines=True)
+            if not lines.endswith("\n"):
+                lines += "\n"
+            yield lines
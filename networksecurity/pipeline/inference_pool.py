@@ -0,0 +1,118 @@
+import asyncio
+import io
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.constant.training_pipeline import (
+    FINAL_MODEL_FILE_PATH,
+    FINAL_MODEL_MANIFEST_FILE_PATH,
+    FINAL_PREPROCESSOR_FILE_PATH,
+    INFERENCE_POOL_MAX_PENDING,
+    INFERENCE_POOL_MAX_WORKERS,
+    PREDICTION_OUTPUT_COLUMN,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.ml_utils.model.model_cache import NetworkModelCache
+
+## one model cache per worker process, created by the pool initializer
+_worker_model_cache = None
+
+
+def _init_worker(preprocessor_file_path: str, model_file_path: str, manifest_file_path: str):
+    global _worker_model_cache
+    _worker_model_cache = NetworkModelCache(preprocessor_file_path=preprocessor_file_path,
+                                            model_file_path=model_file_path,
+                                            manifest_file_path=manifest_file_path)
+    try:
+        _worker_model_cache.refresh()
+    except Exception as e:
+        logging.warning(f"Inference worker {os.getpid()} started without a model: {str(e)}")
+    _worker_model_cache.start_watcher()
+
+
+def _warm_up() -> int:
+    return _worker_model_cache.version
+
+
+def _predict_array(x) -> np.ndarray:
+    return _worker_model_cache.predict(x)
+
+
+def _predict_csv_as_html(csv_bytes: bytes) -> str:
+    df = pd.read_csv(io.BytesIO(csv_bytes))
+    df[PREDICTION_OUTPUT_COLUMN] = _predict_array(df)
+    os.makedirs("prediction_output", exist_ok=True)
+    df.to_csv("prediction_output/output.csv")
+    return df.to_html(classes="table table-striped")
+
+
+class InferencePoolFullError(Exception):
+    pass
+
+
+class InferencePool:
+    """
+    Process pool whose workers preload the preprocessor and model at start-up.
+
+    CSV parsing, imputation, inference and HTML rendering all run in the workers, so the
+    event loop only moves bytes. At most max_pending calls may be queued or running;
+    beyond that InferencePoolFullError is raised instead of growing the backlog.
+    """
+    def __init__(self, max_workers: int = INFERENCE_POOL_MAX_WORKERS,
+                 max_pending: int = INFERENCE_POOL_MAX_PENDING,
+                 preprocessor_file_path: str = FINAL_PREPROCESSOR_FILE_PATH,
+                 model_file_path: str = FINAL_MODEL_FILE_PATH,
+                 manifest_file_path: str = FINAL_MODEL_MANIFEST_FILE_PATH):
+        try:
+            self.max_workers = max_workers
+            self.max_pending = max_pending
+            self.preprocessor_file_path = preprocessor_file_path
+            self.model_file_path = model_file_path
+            self.manifest_file_path = manifest_file_path
+            self._executor = None
+            self._pending = 0
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    async def start(self):
+        try:
+            ## spawn rather than fork, the parent already runs the event loop and watcher threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.preprocessor_file_path, self.model_file_path, self.manifest_file_path),
+            )
+            warm_ups = [asyncio.wrap_future(self._executor.submit(_warm_up)) for _ in range(self.max_workers)]
+            await asyncio.gather(*warm_ups)
+            logging.info(f"Inference pool started with {self.max_workers} workers")
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn, *args):
+        if self._executor is None:
+            raise RuntimeError("InferencePool.start() has not been awaited")
+        if self._pending >= self.max_pending:
+            raise InferencePoolFullError(f"Inference queue is full ({self.max_pending} pending requests)")
+        self._pending += 1
+        try:
+            return await asyncio.wrap_future(self._executor.submit(fn, *args))
+        finally:
+            self._pending -= 1
+
+    async def predict(self, x) -> np.ndarray:
+        return await self.run(_predict_array, x)
+
+    async def predict_csv_as_html(self, csv_bytes: bytes) -> str:
+        return await self.run(_predict_csv_as_html, csv_bytes)
@@ -0,0 +1,168 @@
+import multiprocessing
+import os
+import sys
+import threading
+import uuid
+from datetime import datetime
+from typing import Optional
+
+import yaml
+
+from networksecurity.constant.training_pipeline import (
+    TRAINING_JOB_CURRENT_FILE_NAME,
+    TRAINING_JOB_DIR,
+    TRAINING_JOB_LOCK_FILE_NAME,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.utils import read_yaml_file
+
+try:
+    import fcntl
+except ImportError:
+    ## no flock on Windows, fall back to single-flight within this process only
+    fcntl = None
+
+
+def _status_file_path(job_dir: str, job_id: str) -> str:
+    return os.path.join(job_dir, f"{job_id}.yaml")
+
+
+def _write_status(job_dir: str, status: dict) -> None:
+    ## replace rather than rewrite in place, the API process may be reading it
+    file_path = _status_file_path(job_dir, status["job_id"])
+    temp_file_path = f"{file_path}.tmp"
+    with open(temp_file_path, "w") as file:
+        yaml.dump(status, file)
+    os.replace(temp_file_path, file_path)
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _run_training_job(job_id: str, job_dir: str) -> None:
+    """
+    Entry point of the training process, records stage-level progress in the job's status file
+    """
+    from networksecurity.pipeline.training_pipeline import TrainingPipeline
+
+    status = read_yaml_file(_status_file_path(job_dir, job_id))
+    status.update({"state": "running", "started_at": _now(), "pid": os.getpid()})
+    _write_status(job_dir, status)
+
+    def on_progress(stage_name, state, duration):
+        status["current_stage"] = stage_name
+        status["stages"][stage_name] = {"state": state, "duration_seconds": duration}
+        _write_status(job_dir, status)
+
+    try:
+        TrainingPipeline(progress_callback=on_progress).run_pipeline()
+        status.update({"state": "completed", "finished_at": _now()})
+        _write_status(job_dir, status)
+    except Exception as e:
+        status.update({"state": "failed", "finished_at": _now(), "error": str(e)})
+        _write_status(job_dir, status)
+        sys.exit(1)
+
+
+class TrainingJobRunner:
+    """
+    Runs TrainingPipeline in a separate process so the API stays responsive.
+
+    Only one training run may be active at a time across all API workers: a trigger
+    while a run is in flight returns the running job instead of starting another.
+    """
+    def __init__(self, job_dir: str = TRAINING_JOB_DIR):
+        try:
+            self.job_dir = job_dir
+            self.lock_file_path = os.path.join(job_dir, TRAINING_JOB_LOCK_FILE_NAME)
+            self.current_job_file_path = os.path.join(job_dir, TRAINING_JOB_CURRENT_FILE_NAME)
+            self._lock = threading.Lock()
+            self._process = None
+            os.makedirs(job_dir, exist_ok=True)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _try_acquire_run_lock(self):
+        """
+        Returns the open lock file when this caller may start a run, otherwise None
+        """
+        if fcntl is None:
+            if self._process is not None and self._process.is_alive():
+                return None
+            return open(self.lock_file_path, "a")
+        lock_file = open(self.lock_file_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return lock_file
+        except BlockingIOError:
+            lock_file.close()
+            return None
+
+    def _release_run_lock(self, lock_file):
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+        lock_file.close()
+
+    def _current_job_id(self) -> Optional[str]:
+        if not os.path.exists(self.current_job_file_path):
+            return None
+        with open(self.current_job_file_path) as file:
+            return file.read().strip() or None
+
+    def submit(self) -> dict:
+        """
+        Start a training run, or coalesce into the one already running
+        """
+        try:
+            with self._lock:
+                lock_file = self._try_acquire_run_lock()
+                if lock_file is None:
+                    job_id = self._current_job_id()
+                    logging.info(f"Training job {job_id} already running, coalescing trigger")
+                    return {"job_id": job_id, "coalesced": True}
+
+                job_id = uuid.uuid4().hex
+                _write_status(self.job_dir, {
+                    "job_id": job_id,
+                    "state": "queued",
+                    "created_at": _now(),
+                    "current_stage": None,
+                    "stages": {},
+                })
+                with open(self.current_job_file_path, "w") as file:
+                    file.write(job_id)
+
+                process = multiprocessing.get_context("spawn").Process(
+                    target=_run_training_job, args=(job_id, self.job_dir), name=f"training-{job_id}"
+                )
+                process.start()
+                self._process = process
+                threading.Thread(target=self._wait_for_job, args=(process, lock_file, job_id), daemon=True).start()
+                logging.info(f"Started training job {job_id} in process {process.pid}")
+                return {"job_id": job_id, "coalesced": False}
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _wait_for_job(self, process, lock_file, job_id: str):
+        process.join()
+        try:
+            status = self.get_status(job_id)
+            ## the process died before it could record the failure itself
+            if status is not None and status.get("state") in ("queued", "running"):
+                status.update({"state": "failed", "finished_at": _now(),
+                               "error": f"training process exited with code {process.exitcode}"})
+                _write_status(self.job_dir, status)
+        finally:
+            self._release_run_lock(lock_file)
+        logging.info(f"Training job {job_id} finished with exit code {process.exitcode}")
+
+    def get_status(self, job_id: str) -> Optional[dict]:
+        try:
+            file_path = _status_file_path(self.job_dir, os.path.basename(job_id))
+            if not os.path.exists(file_path):
+                return None
+            return read_yaml_file(file_path)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
@@ -8,6 +9,7 @@ from networksecurity.components.data_ingestion import DataIngestion
 from networksecurity.components.data_validation import DataValidation
 from networksecurity.components.data_transformation import DataTransformation
 from networksecurity.components.model_trainer import ModelTrainer
+from networksecurity.components.feature_cost_analysis import FeatureCostAnalysis
 
 from networksecurity.entity.config_entity import(
     TrainingPipelineConfig,
@@ -15,6 +17,7 @@ from networksecurity.entity.config_entity import(
     DataValidationConfig,
     DataTransformationConfig,
     ModelTrainerConfig,
+    FeatureCostAnalysisConfig,
 )
 
 from networksecurity.entity.artifact_entity import (
@@ -22,18 +25,43 @@ from networksecurity.entity.artifact_entity import (
     DataValidationArtifact,
     DataTransformationArtifact,
     ModelTrainerArtifact,
+    FeatureCostAnalysisArtifact,
 )
 
 from networksecurity.constant.training_pipeline import TRAINING_BUCKET_NAME
 from networksecurity.cloud.s3_syncer import S3Sync
 from networksecurity.constant.training_pipeline import SAVED_MODEL_DIR
+from networksecurity.utils.main_utils.feature_transport import FixtureStore
 import sys
 
 
 class TrainingPipeline:
-    def __init__(self):
+    def __init__(self,progress_callback=None):
+        """
+        progress_callback: optional callable(stage_name, state, duration_seconds) invoked
+        when each stage starts, completes or fails
+        """
         self.training_pipeline_config=TrainingPipelineConfig()
         self.s3_sync = S3Sync()
+        self.progress_callback = progress_callback
+        self.stage_timings: dict = {}
+
+    def _run_stage(self,stage_name,stage_fn,**kwargs):
+        if self.progress_callback:
+            self.progress_callback(stage_name,"running",None)
+        start_time=time.perf_counter()
+        try:
+            artifact=stage_fn(**kwargs)
+        except Exception:
+            if self.progress_callback:
+                self.progress_callback(stage_name,"failed",time.perf_counter()-start_time)
+            raise
+        duration=time.perf_counter()-start_time
+        self.stage_timings[stage_name]=duration
+        logging.info(f"Stage {stage_name} completed in {duration:.2f}s")
+        if self.progress_callback:
+            self.progress_callback(stage_name,"completed",duration)
+        return artifact
         
 
     def start_data_ingestion(self):
@@ -87,6 +115,29 @@ class TrainingPipeline:
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
+    def start_feature_cost_analysis(self,data_transformation_artifact:DataTransformationArtifact)->FeatureCostAnalysisArtifact:
+        """
+        Choose and publish the feature subset model, skipped when no probe fixtures were recorded
+        """
+        try:
+            feature_cost_analysis_config=FeatureCostAnalysisConfig(training_pipeline_config=self.training_pipeline_config)
+            if not os.path.exists(feature_cost_analysis_config.fixture_file_path):
+                logging.info(f"No probe fixtures at {feature_cost_analysis_config.fixture_file_path}, skipping feature cost analysis")
+                return None
+            model_trainer=ModelTrainer(
+                data_transformation_artifact=data_transformation_artifact,
+                model_trainer_config=ModelTrainerConfig(training_pipeline_config=self.training_pipeline_config),
+            )
+            feature_cost_analysis=FeatureCostAnalysis(
+                feature_cost_analysis_config=feature_cost_analysis_config,
+                data_transformation_artifact=data_transformation_artifact,
+                model_trainer=model_trainer,
+            )
+            return feature_cost_analysis.initiate_feature_cost_analysis(
+                fixture_store=FixtureStore(feature_cost_analysis_config.fixture_file_path))
+        except Exception as e:
+            raise NetworkSecurityException(e,sys)
+
     ## local artifact is going to s3 bucket    
     def sync_artifact_dir_to_s3(self):
         try:
@@ -112,13 +163,18 @@ class TrainingPipeline:
     
     def run_pipeline(self):
         try:
-            data_ingestion_artifact=self.start_data_ingestion()
-            data_validation_artifact=self.start_data_validation(data_ingestion_artifact=data_ingestion_artifact)
-            data_transformation_artifact=self.start_data_transformation(data_validation_artifact=data_validation_artifact)
-            model_trainer_artifact=self.start_model_trainer(data_transformation_artifact=data_transformation_artifact)
+            data_ingestion_artifact=self._run_stage("data_ingestion",self.start_data_ingestion)
+            data_validation_artifact=self._run_stage("data_validation",self.start_data_validation,
+                                                     data_ingestion_artifact=data_ingestion_artifact)
+            data_transformation_artifact=self._run_stage("data_transformation",self.start_data_transformation,
+                                                         data_validation_artifact=data_validation_artifact)
+            model_trainer_artifact=self._run_stage("model_trainer",self.start_model_trainer,
+                                                   data_transformation_artifact=data_transformation_artifact)
+            self._run_stage("feature_cost_analysis",self.start_feature_cost_analysis,
+                            data_transformation_artifact=data_transformation_artifact)
             
-            self.sync_artifact_dir_to_s3()
-            self.sync_saved_model_dir_to_s3()
+            self._run_stage("sync_artifact_dir_to_s3",self.sync_artifact_dir_to_s3)
+            self._run_stage("sync_saved_model_dir_to_s3",self.sync_saved_model_dir_to_s3)
             
             return model_trainer_artifact
         except Exception as e:
@@ -0,0 +1,223 @@
+import asyncio
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+from urllib.parse import urlsplit
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from networksecurity.constant.training_pipeline import (
+    PREDICTION_OUTPUT_COLUMN,
+    URL_SCORING_BATCH_SIZE,
+    URL_SCORING_DEADLINE_SECONDS,
+    URL_SCORING_DEGRADED_COLUMN,
+    URL_SCORING_MAX_CONCURRENCY,
+    URL_SCORING_PER_HOST_LIMIT,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.pipeline.inference_pool import InferencePoolFullError
+from networksecurity.utils.main_utils.feature_extraction import (
+    DEFAULT_RESOLVER,
+    HEADERS,
+    PROBE_GROUPS,
+    REQUEST_TIMEOUT,
+    PageContext,
+    extract_domain,
+    extract_features_with_deadline,
+)
+
+## probe groups that resolve the registered domain, see CachingResolver
+RESOLVING_PROBE_GROUPS = ("dns", "tls")
+from networksecurity.utils.main_utils.payload_codec import get_feature_columns
+from networksecurity.utils.ml_utils.model.model_manifest import read_model_manifest
+
+
+def create_session(pool_size: int) -> requests.Session:
+    """
+    A requests session whose keep-alive pool can hold one connection per concurrent probe
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+class BulkUrlScorer:
+    """
+    Extracts features for many URLs concurrently and scores them in batches.
+
+    The blocking probes of each URL run in a thread pool driven from asyncio. At most
+    max_concurrency URLs are probed at once and at most per_host_limit of them share a
+    host. Whenever batch_size URLs are extracted they are sent to predict_fn together.
+    Each URL gets deadline_seconds in total, probes still running then are reported as
+    degraded features and left for the imputer. probe_groups restricts the probes to the
+    named groups. When the dns or tls probes run, the registered domains of all URLs are
+    resolved up front in one concurrent bulk lookup through the shared CachingResolver.
+
+    feature_subset_file_path names the manifest FeatureCostAnalysis publishes. When it
+    exists, only the probe groups of the chosen subset run and predict_fn receives only
+    its feature columns. The manifest is read again whenever a retrain replaces it.
+
+    A long-lived scorer calls start() once to keep its thread pools and HTTP session
+    across score() calls and shutdown() when it is done. Otherwise each score() call
+    creates and closes its own.
+    """
+    def __init__(self, max_concurrency: int = URL_SCORING_MAX_CONCURRENCY,
+                 per_host_limit: int = URL_SCORING_PER_HOST_LIMIT,
+                 batch_size: int = URL_SCORING_BATCH_SIZE,
+                 deadline_seconds: float = URL_SCORING_DEADLINE_SECONDS,
+                 probe_groups: Optional[List[str]] = None,
+                 feature_subset_file_path: Optional[str] = None):
+        try:
+            self.max_concurrency = max_concurrency
+            self.per_host_limit = per_host_limit
+            self.batch_size = batch_size
+            self.deadline_seconds = deadline_seconds
+            self.feature_subset_file_path = feature_subset_file_path
+            self.feature_columns = get_feature_columns()
+            self.probe_groups = probe_groups
+            self._feature_subset_signature = None
+            self._executor = None
+            self._probe_executor = None
+            self._session = None
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def start(self):
+        try:
+            if self._executor is not None:
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="url-scoring")
+            ## probes that overrun the deadline keep their thread, the pool must not stop other URLs
+            self._probe_executor = ThreadPoolExecutor(max_workers=self.max_concurrency * len(PROBE_GROUPS),
+                                                      thread_name_prefix="probe")
+            self._session = create_session(self.max_concurrency)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._probe_executor.shutdown(wait=False, cancel_futures=True)
+            self._session.close()
+            self._executor = self._probe_executor = self._session = None
+
+    @property
+    def uses_feature_subset(self) -> bool:
+        return self._feature_subset_signature is not None
+
+    def refresh_feature_subset(self):
+        """
+        Load the chosen subset's columns and probe groups if its manifest changed
+        """
+        try:
+            if not self.feature_subset_file_path or not os.path.exists(self.feature_subset_file_path):
+                return
+            stat = os.stat(self.feature_subset_file_path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature == self._feature_subset_signature:
+                return
+            manifest = read_model_manifest(self.feature_subset_file_path)
+            self.feature_columns, self.probe_groups = list(manifest["features"]), list(manifest["probe_groups"])
+            self._feature_subset_signature = signature
+            logging.info(f"Scoring URLs with feature subset {manifest['version']}: probe groups {self.probe_groups}, "
+                         f"{len(self.feature_columns)} features")
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _extract(self, url: str, session: requests.Session, probe_executor: ThreadPoolExecutor,
+                 probe_groups: Optional[List[str]] = None):
+        try:
+            context = PageContext(url, session=session, timeout=min(REQUEST_TIMEOUT, self.deadline_seconds))
+            return extract_features_with_deadline(url, context, self.deadline_seconds, probe_executor,
+                                                  probe_groups=probe_groups)
+        except Exception as e:
+            ## an unusable URL leaves its row empty for the imputer instead of failing the batch
+            logging.warning(f"Feature extraction failed for {url}: {str(e)}")
+            return {}, list(self.feature_columns)
+
+    async def _predict_batch(self, indices: List[int], rows: list, feature_columns: List[str],
+                             predict_fn: Callable, predictions: list):
+        ## only the columns the model was trained on, features of skipped probe groups are dropped
+        x = pd.DataFrame([rows[index] for index in indices], columns=feature_columns)
+        if asyncio.iscoroutinefunction(predict_fn):
+            y_pred = await predict_fn(x)
+        else:
+            y_pred = await asyncio.get_running_loop().run_in_executor(None, predict_fn, x)
+        for index, y_hat in zip(indices, y_pred):
+            predictions[index] = y_hat
+
+    async def score(self, urls: List[str], predict_fn: Callable) -> pd.DataFrame:
+        """
+        urls: URLs to score
+        predict_fn: NetworkModel.predict or a coroutine function with the same contract
+        return: one row per URL with its features, the prediction column and the
+                comma separated names of the features that missed the deadline
+        """
+        try:
+            self.refresh_feature_subset()
+            feature_columns, probe_groups = self.feature_columns, self.probe_groups
+            loop = asyncio.get_running_loop()
+            global_semaphore = asyncio.Semaphore(self.max_concurrency)
+            host_semaphores = defaultdict(lambda: asyncio.Semaphore(self.per_host_limit))
+            rows = [None] * len(urls)
+            degraded = [None] * len(urls)
+            predictions = [None] * len(urls)
+
+            owns_pools = self._executor is None
+            if owns_pools:
+                self.start()
+            executor, probe_executor, session = self._executor, self._probe_executor, self._session
+
+            async def extract_one(index: int, url: str):
+                ## wait for the host slot first so a busy host does not hold global slots
+                async with host_semaphores[urlsplit(url).hostname or ""]:
+                    async with global_semaphore:
+                        return index, await loop.run_in_executor(executor, self._extract, url, session,
+                                                                 probe_executor, probe_groups)
+
+            ## runs alongside the extraction, probes for a domain still resolving wait on its host lock
+            prefetch = None
+            if any(group in (probe_groups or PROBE_GROUPS) for group in RESOLVING_PROBE_GROUPS):
+                domains = [extract_domain(url).registered_domain for url in urls]
+                prefetch = loop.run_in_executor(None, DEFAULT_RESOLVER.resolve_many, domains)
+            tasks = [asyncio.ensure_future(extract_one(index, url)) for index, url in enumerate(urls)]
+            try:
+                ready = []
+                for task in asyncio.as_completed(tasks):
+                    index, (features, degraded_features) = await task
+                    rows[index] = features
+                    degraded[index] = ",".join(degraded_features)
+                    ready.append(index)
+                    if len(ready) >= self.batch_size:
+                        await self._predict_batch(ready, rows, feature_columns, predict_fn, predictions)
+                        ready = []
+                if ready:
+                    await self._predict_batch(ready, rows, feature_columns, predict_fn, predictions)
+                if prefetch is not None:
+                    await prefetch
+            finally:
+                ## a failed batch leaves no URLs queued for the shared pools
+                for task in tasks:
+                    task.cancel()
+                if owns_pools:
+                    self.shutdown()
+
+            scored_df = pd.DataFrame(rows, columns=feature_columns)
+            scored_df.insert(0, "url", urls)
+            scored_df[PREDICTION_OUTPUT_COLUMN] = predictions
+            scored_df[URL_SCORING_DEGRADED_COLUMN] = degraded
+            logging.info(f"Scored {len(urls)} URLs, {sum(1 for d in degraded if d)} of them with degraded features")
+            return scored_df
+        except InferencePoolFullError:
+            ## left for the caller to answer with 503
+            raise
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
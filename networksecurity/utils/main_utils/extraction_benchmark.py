@@ -0,0 +1,198 @@
+import argparse
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.feature_extraction import (
+    DEFAULT_RESOLVER,
+    DOMAIN_FEATURES,
+    HEADERS,
+    LEXICAL_FEATURES,
+    PROBE_GROUPS,
+    PageContext,
+    Statistical_report,
+    extract_all_features,
+)
+from networksecurity.utils.main_utils.feature_transport import (
+    FixtureStore,
+    LiveTransport,
+    RecordingTransport,
+    ReplayTransport,
+)
+from networksecurity.utils.main_utils.html_signals import collect_page_signals
+
+
+def _soup_signals(html: str):
+    """
+    The work the HTML features used to do: one BeautifulSoup tree per feature, each
+    followed by its own search.
+    """
+    from bs4 import BeautifulSoup
+
+    def soup():
+        return BeautifulSoup(html, "html.parser")
+
+    soup().find("link", rel=lambda v: v and 'icon' in v.lower())
+    soup().find_all(["img", "script", "link"])
+    soup().find_all("a", href=True)
+    links = soup()
+    for tag_name in ["link", "meta", "script"]:
+        links.find_all(tag_name, href=True)
+    soup().find_all("form", action=True)
+    soup().find(href=lambda href: href and href.startswith("mailto:"))
+    soup().find(attrs={"onmouseover": True})
+    soup().find(attrs={"oncontextmenu": True})
+    soup()
+    soup().find_all("iframe")
+
+
+def _time_per_page(parse_fn, pages: List[str], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for html in pages:
+            parse_fn(html)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pages)
+
+
+def benchmark_html_parsing(pages: List[str], repeats: int = 3) -> Dict[str, float]:
+    """
+    Compare the per-feature BeautifulSoup scans with the single pass signal collector.
+
+    pages: raw HTML documents, ideally saved from real phishing kits
+    return: best seconds per page of each approach and the speedup
+    """
+    try:
+        if not pages:
+            raise ValueError("At least one page is required to benchmark HTML parsing")
+        soup_seconds = _time_per_page(_soup_signals, pages, repeats)
+        collector_seconds = _time_per_page(collect_page_signals, pages, repeats)
+        report = {
+            "soup_seconds_per_page": soup_seconds,
+            "collector_seconds_per_page": collector_seconds,
+            "speedup": soup_seconds / collector_seconds if collector_seconds else float("inf"),
+        }
+        logging.info(f"HTML parsing benchmark over {len(pages)} pages: {report}")
+        return report
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def record_corpus(urls: List[str], fixture_file_path: str, max_workers: int = 32) -> FixtureStore:
+    """
+    Extract features of urls against the live network once and record every probe answer
+    """
+    try:
+        fixture_store = FixtureStore(fixture_file_path)
+        transport = RecordingTransport(LiveTransport(DEFAULT_RESOLVER, headers=HEADERS), fixture_store)
+
+        def record(url):
+            try:
+                extract_all_features(url, PageContext(url, transport=transport))
+            except Exception as e:
+                logging.warning(f"Recording {url} failed: {str(e)}")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(record, urls))
+        fixture_store.save()
+        return fixture_store
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def _timed(timings: Dict[str, float], name: str, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    timings[name] += time.perf_counter() - start
+    return result
+
+
+def benchmark_feature_extraction(fixture_store: FixtureStore, urls: Optional[List[str]] = None,
+                                 latency_seconds: Optional[Dict[str, float]] = None,
+                                 concurrency: int = 1) -> Dict[str, dict]:
+    """
+    Measure the extractor offline against recorded fixtures.
+
+    Per feature timings run each probe first (reported as probe:<name>) and then every
+    feature on the warm context, so a feature is charged only for its own work. The end to
+    end run calls extract_all_features with a fresh context per URL on concurrency threads.
+
+    fixture_store: fixtures written by record_corpus
+    urls: the URLs to replay, all recorded URLs by default
+    latency_seconds: injected delay per probe kind, see ReplayTransport
+    return: {"per_feature": {name: mean seconds per URL}, "end_to_end": {...}}
+    """
+    try:
+        urls = urls if urls is not None else fixture_store.urls()
+        if not urls:
+            raise ValueError("The fixture store holds no recorded pages")
+        transport = ReplayTransport(fixture_store, latency_seconds=latency_seconds)
+
+        timings = defaultdict(float)
+        for url in urls:
+            context = PageContext(url, transport=transport)
+            _timed(timings, "probe:fetch", lambda: context.response)
+            _timed(timings, "probe:scan", lambda: context.signals)
+            _timed(timings, "probe:whois", lambda: context.whois)
+            _timed(timings, "probe:dns", lambda: context.addresses)
+            features = {}
+            for name, fn in LEXICAL_FEATURES.items():
+                features[name] = _timed(timings, name, fn, url)
+            for fn in DOMAIN_FEATURES + [fn for feature_fns in PROBE_GROUPS.values() for fn in feature_fns]:
+                features[fn.__name__] = _timed(timings, fn.__name__, fn, url, context)
+            _timed(timings, "Statistical_report", Statistical_report, url, context, features)
+        per_feature = {name: total / len(urls) for name, total in sorted(timings.items(), key=lambda item: -item[1])}
+
+        def extract(url):
+            return extract_all_features(url, PageContext(url, transport=transport))
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(extract, urls))
+        elapsed = time.perf_counter() - start
+        end_to_end = {
+            "urls": len(urls),
+            "concurrency": concurrency,
+            "seconds": elapsed,
+            "urls_per_second": len(urls) / elapsed if elapsed else float("inf"),
+        }
+        logging.info(f"Feature extraction benchmark: {end_to_end}")
+        return {"per_feature": per_feature, "end_to_end": end_to_end}
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record probe fixtures or benchmark feature extraction offline")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    record_parser = subparsers.add_parser("record", help="record fixtures for a file of URLs, one per line")
+    record_parser.add_argument("url_file")
+    record_parser.add_argument("fixture_file")
+    record_parser.add_argument("--workers", type=int, default=32)
+    run_parser = subparsers.add_parser("run", help="benchmark extraction against recorded fixtures")
+    run_parser.add_argument("fixture_file")
+    run_parser.add_argument("--concurrency", type=int, default=1)
+    run_parser.add_argument("--fetch-latency-ms", type=float, default=0)
+    run_parser.add_argument("--whois-latency-ms", type=float, default=0)
+    run_parser.add_argument("--dns-latency-ms", type=float, default=0)
+    run_parser.add_argument("--tls-latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        with open(args.url_file) as file_obj:
+            urls = [line.strip() for line in file_obj if line.strip()]
+        store = record_corpus(urls, args.fixture_file, max_workers=args.workers)
+        print(f"Recorded {len(store)} fixtures for {len(urls)} URLs")
+    else:
+        latency = {"fetch": args.fetch_latency_ms / 1000, "whois": args.whois_latency_ms / 1000,
+                   "resolve": args.dns_latency_ms / 1000, "tls": args.tls_latency_ms / 1000}
+        report = benchmark_feature_extraction(FixtureStore(args.fixture_file), latency_seconds=latency,
+                                              concurrency=args.concurrency)
+        for name, seconds in report["per_feature"].items():
+            print(f"{name:32s} {seconds * 1e6:12.1f} us/url")
+        print(report["end_to_end"])
@@ -1,19 +1,232 @@
 # networksecurity/utils/main_utils/feature_extraction.py
 
+import os
 import re
-import socket
-import ssl
-import requests
+import threading
+import time
 import tldextract
-import whois
-from bs4 import BeautifulSoup
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, wait
 import dns.resolver
 
+from networksecurity.utils.main_utils.html_signals import collect_page_signals
+from networksecurity.utils.main_utils.feature_transport import LiveTransport
+
 # ---------- Config ----------
 REQUEST_TIMEOUT = 6
 HEADERS = {"User-Agent": "Mozilla/5.0 (X11; Linux x86_64) PyChecker/1.0"}
-SHORTENERS_REGEX = re.compile(r"(bit\.ly|tinyurl\.com|goo\.gl|ow\.ly|t\.co|is\.gd|buff\.ly|adf\.ly)")
+SHORTENERS_REGEX = re.compile(r"(?:bit\.ly|tinyurl\.com|goo\.gl|ow\.ly|t\.co|is\.gd|buff\.ly|adf\.ly)")
+DNS_TIMEOUT = 3
+DNS_MIN_TTL = 30
+DNS_MAX_TTL = 3600
+DNS_NEGATIVE_TTL = 300
+DOMAIN_CACHE_SIZE = 65536
+DNS_CACHE_SIZE = 65536
+DNS_RESOLVE_WORKERS = 32
+URL_DEADLINE_SECONDS = 8
+PROBE_WORKERS = 32
+
+# ---------- Domain Parsing ----------
+def _create_tld_extractor():
+    """
+    Never download the public suffix list: use the file named by PUBLIC_SUFFIX_LIST_FILE
+    when set, otherwise the snapshot bundled with tldextract.
+    """
+    suffix_list_file = os.getenv("PUBLIC_SUFFIX_LIST_FILE")
+    if suffix_list_file and os.path.exists(suffix_list_file):
+        suffix_list_urls = ("file://" + os.path.abspath(suffix_list_file),)
+    else:
+        suffix_list_urls = ()
+    return tldextract.TLDExtract(suffix_list_urls=suffix_list_urls, fallback_to_snapshot=True)
+
+TLD_EXTRACTOR = _create_tld_extractor()
+## load the suffix list now rather than on the first request
+TLD_EXTRACTOR("example.com")
+
+def _host_of(url):
+    netloc = url.split("://", 1)[1] if "://" in url else url
+    ## protocol-relative links such as //cdn.example.com/x.js carry a host but no scheme
+    if "://" not in url and netloc.startswith("//"):
+        netloc = netloc[2:]
+    netloc = re.split(r"[/?#]", netloc, maxsplit=1)[0]
+    netloc = netloc.rsplit("@", 1)[-1]
+    return netloc.split(":", 1)[0] if not netloc.startswith("[") else netloc
+
+@lru_cache(maxsize=DOMAIN_CACHE_SIZE)
+def _extract_host(host):
+    return TLD_EXTRACTOR(host)
+
+def extract_domain(url):
+    """
+    tldextract result for url, memoized by host so repeated hosts cost a dict lookup
+    """
+    return _extract_host(_host_of(url))
+
+# ---------- DNS Resolver ----------
+class CachingResolver:
+    """
+    Resolves A records once per TTL and serves both DNSRecord and the TLS probe.
+
+    Positive answers are kept for their record TTL clamped to [min_ttl, max_ttl].
+    NXDOMAIN, empty answers and timeouts are kept for negative_ttl, so repeated bad
+    domains in a batch cost no further round-trips. At most max_entries hosts are kept,
+    the least recently used go first, and a host's lock only lives while it resolves.
+    """
+    def __init__(self, min_ttl=DNS_MIN_TTL, max_ttl=DNS_MAX_TTL, negative_ttl=DNS_NEGATIVE_TTL, timeout=DNS_TIMEOUT,
+                 max_entries=DNS_CACHE_SIZE):
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._resolver = dns.resolver.Resolver()
+        self._resolver.lifetime = timeout
+        self._cache = OrderedDict()
+        self._host_locks = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, host):
+        with self._lock:
+            entry = self._cache.get(host)
+            if entry is None:
+                return False, None
+            if entry[1] <= time.monotonic():
+                del self._cache[host]
+                return False, None
+            self._cache.move_to_end(host)
+            return True, entry[0]
+
+    def _store(self, host, addresses, ttl):
+        with self._lock:
+            self._cache[host] = (addresses, time.monotonic() + ttl)
+            self._cache.move_to_end(host)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            ## later callers find the answer in the cache, waiters still hold the lock object
+            self._host_locks.pop(host, None)
+
+    def _host_lock(self, host):
+        with self._lock:
+            return self._host_locks.setdefault(host, threading.Lock())
+
+    def resolve(self, host):
+        """
+        IPv4 addresses of host, or None when it does not resolve
+        """
+        if not host:
+            return None
+        found, addresses = self._cached(host)
+        if found:
+            return addresses
+        with self._host_lock(host):
+            found, addresses = self._cached(host)
+            if found:
+                return addresses
+            try:
+                answer = self._resolver.resolve(host, "A")
+                addresses = [record.address for record in answer]
+                ttl = min(max(answer.rrset.ttl, self.min_ttl), self.max_ttl)
+            except Exception:
+                addresses, ttl = None, self.negative_ttl
+            self._store(host, addresses, ttl)
+            return addresses
+
+    def resolve_many(self, hosts, max_workers=DNS_RESOLVE_WORKERS):
+        """
+        Resolve many hosts concurrently, each distinct host at most once. Hosts already
+        cached are answered without a thread, the others share the cache and host locks
+        with resolve, so a probe asking for a host in flight waits for its answer.
+        return: {host: addresses or None}
+        """
+        answers = {}
+        pending = []
+        for host in dict.fromkeys(host for host in hosts if host):
+            found, addresses = self._cached(host)
+            if found:
+                answers[host] = addresses
+            else:
+                pending.append(host)
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(pending)), thread_name_prefix="dns") as executor:
+                answers.update(zip(pending, executor.map(self.resolve, pending)))
+        return answers
+
+DEFAULT_RESOLVER = CachingResolver()
+
+# ---------- Page Context ----------
+class _memoized_property:
+    """
+    Computed once per instance under that instance's own lock. functools.cached_property
+    shares one lock per attribute across all instances on Python 3.11 and older, which
+    would serialize every fetch and WHOIS lookup in the process.
+    """
+    def __init__(self, fn):
+        self.fn = fn
+        self.name = fn.__name__
+        self.__doc__ = fn.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        values = instance._values
+        if self.name in values:
+            return values[self.name]
+        with instance._locks[self.name]:
+            if self.name not in values:
+                values[self.name] = self.fn(instance)
+            return values[self.name]
+
+class PageContext:
+    """
+    Everything the features learn about one URL. The page is downloaded once, scanned once
+    and WHOIS is queried once, however many features read them. Pass a shared
+    requests.Session to reuse keep-alive connections across URLs. WHOIS answers come
+    from a WhoisCache shared by all worker processes.
+
+    Every probe goes through transport, a LiveTransport by default. Pass a
+    RecordingTransport or ReplayTransport to capture or replay fixtures offline.
+    """
+    def __init__(self, url, session=None, whois_cache=None, resolver=None, timeout=REQUEST_TIMEOUT, transport=None):
+        self.url = url
+        self.timeout = timeout
+        if transport is None:
+            transport = LiveTransport(resolver if resolver is not None else DEFAULT_RESOLVER,
+                                      session=session, whois_cache=whois_cache, headers=HEADERS)
+        self.transport = transport
+        ## probe groups read the same context from several threads, each value is computed once
+        self._values = {}
+        self._locks = {name: threading.Lock() for name, attribute in vars(PageContext).items()
+                       if isinstance(attribute, _memoized_property)}
+
+    @_memoized_property
+    def parsed(self):
+        return extract_domain(self.url)
+
+    @_memoized_property
+    def registered_domain(self):
+        return self.parsed.registered_domain
+
+    @_memoized_property
+    def addresses(self):
+        return self.transport.resolve(self.registered_domain)
+
+    @_memoized_property
+    def response(self):
+        return self.transport.fetch(self.url, self.timeout)
+
+    @_memoized_property
+    def signals(self):
+        if self.response is None:
+            return None
+        return collect_page_signals(self.response.text)
+
+    @_memoized_property
+    def whois(self):
+        return self.transport.whois(self.registered_domain)
+
+def _context(url, context):
+    return context if context is not None else PageContext(url)
 
 # ---------- Basic URL Features ----------
 def having_IP_Address(url):
@@ -32,35 +245,25 @@ def double_slash_redirecting(url):
     after_protocol = url.split("://", 1)[-1]
     return 1 if "//" in after_protocol else 0
 
-def Prefix_Suffix(url):
-    parsed = tldextract.extract(url)
+def Prefix_Suffix(url, context=None):
+    parsed = _context(url, context).parsed
     return 1 if "-" in parsed.domain else 0
 
-def having_Sub_Domain(url):
-    parsed = tldextract.extract(url)
+def having_Sub_Domain(url, context=None):
+    parsed = _context(url, context).parsed
     return len(parsed.subdomain.split('.')) if parsed.subdomain else 0
 
 # ---------- SSL & Domain ----------
-def SSLfinal_State(url):
-    parsed = tldextract.extract(url)
-    host = parsed.registered_domain
-    if not host:
-        return 0
-    try:
-        ctx = ssl.create_default_context()
-        with ctx.wrap_socket(socket.socket(), server_hostname=host) as s:
-            s.settimeout(3)
-            s.connect((host, 443))
-            cert = s.getpeercert()
-        return 1 if cert else 0
-    except:
+def SSLfinal_State(url, context=None):
+    context = _context(url, context)
+    host = context.registered_domain
+    if not host or not context.addresses:
         return 0
+    return 1 if context.transport.tls_probe(host, context.addresses[0], min(3, context.timeout)) else 0
 
-def Domain_registeration_length(url):
-    parsed = tldextract.extract(url)
-    domain = parsed.registered_domain
+def Domain_registeration_length(url, context=None):
     try:
-        w = whois.whois(domain)
+        w = _context(url, context).whois
         exp = w.expiration_date
         if isinstance(exp, list):
             exp = exp[0]
@@ -70,11 +273,9 @@ def Domain_registeration_length(url):
     except:
         return -1
 
-def age_of_domain(url):
-    parsed = tldextract.extract(url)
-    domain = parsed.registered_domain
+def age_of_domain(url, context=None):
     try:
-        w = whois.whois(domain)
+        w = _context(url, context).whois
         created = w.creation_date
         if isinstance(created, list):
             created = created[0]
@@ -85,133 +286,98 @@ def age_of_domain(url):
         return -1
 
 # ---------- HTML Features ----------
-def _get_soup(url):
-    try:
-        r = requests.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT, allow_redirects=True)
-        return r, BeautifulSoup(r.text, "html.parser")
-    except:
-        return None, None
+def _get_signals(url, context=None):
+    return _context(url, context).signals
 
-def Favicon(url):
-    r, soup = _get_soup(url)
-    if not soup:
+def Favicon(url, context=None):
+    signals = _get_signals(url, context)
+    if not signals or not signals.found_icon_link or not signals.icon_href:
         return 0
-    link = soup.find("link", rel=lambda v: v and 'icon' in v.lower())
-    if not link or not link.get("href"):
-        return 0
-    href = link["href"]
-    page_domain = tldextract.extract(url).registered_domain
-    href_domain = tldextract.extract(href).registered_domain if href.startswith("http") else page_domain
+    href = signals.icon_href
+    page_domain = _context(url, context).registered_domain
+    href_domain = extract_domain(href).registered_domain if href.startswith("http") else page_domain
     return 0 if href_domain == page_domain else 1
 
-def Request_URL(url):
-    r, soup = _get_soup(url)
-    if not soup:
-        return 0.0
-    resources = [tag.get("src") or tag.get("href") for tag in soup.find_all(["img","script","link"]) if tag.get("src") or tag.get("href")]
-    if not resources:
+def Request_URL(url, context=None):
+    signals = _get_signals(url, context)
+    if not signals or not signals.resources:
         return 0.0
-    page_domain = tldextract.extract(url).registered_domain
-    external = sum(1 for res in resources if tldextract.extract(res).registered_domain and tldextract.extract(res).registered_domain != page_domain)
-    return external / len(resources)
-
-def URL_of_Anchor(url):
-    r, soup = _get_soup(url)
-    if not soup:
+    page_domain = _context(url, context).registered_domain
+    resource_domains = (extract_domain(res).registered_domain for res in signals.resources)
+    external = sum(1 for domain in resource_domains if domain and domain != page_domain)
+    return external / len(signals.resources)
+
+def URL_of_Anchor(url, context=None):
+    signals = _get_signals(url, context)
+    if not signals or not signals.anchor_hrefs:
         return 0.0
-    anchors = soup.find_all("a", href=True)
-    if not anchors:
-        return 0.0
-    page_domain = tldextract.extract(url).registered_domain
+    page_domain = _context(url, context).registered_domain
     suspicious = 0
-    for a in anchors:
-        href = a["href"]
-        if href.startswith("#") or href.lower().startswith("javascript") or href == "" or (tldextract.extract(href).registered_domain and tldextract.extract(href).registered_domain != page_domain):
+    for href in signals.anchor_hrefs:
+        href_domain = extract_domain(href).registered_domain
+        if href.startswith("#") or href.lower().startswith("javascript") or href == "" or (href_domain and href_domain != page_domain):
             suspicious += 1
-    return suspicious / len(anchors)
+    return suspicious / len(signals.anchor_hrefs)
 
-def Links_in_tags(url):
-    r, soup = _get_soup(url)
-    if not soup:
+def Links_in_tags(url, context=None):
+    signals = _get_signals(url, context)
+    if not signals:
         return 0
-    count = 0
-    for tag_name in ["link","meta","script"]:
-        count += len(soup.find_all(tag_name, href=True))
-    return count
-
-def SFH(url):
-    r, soup = _get_soup(url)
-    if not soup:
+    return signals.links_in_tags
+
+def SFH(url, context=None):
+    signals = _get_signals(url, context)
+    if not signals:
         return 0
-    forms = soup.find_all("form", action=True)
-    page_domain = tldextract.extract(url).registered_domain
+    page_domain = _context(url, context).registered_domain
     suspicious = 0
-    for f in forms:
-        a = f["action"]
-        if a == "" or a is None or (tldextract.extract(a).registered_domain and tldextract.extract(a).registered_domain != page_domain):
+    for a in signals.form_actions:
+        action_domain = extract_domain(a).registered_domain if a else ""
+        if a == "" or (action_domain and action_domain != page_domain):
             suspicious += 1
     return suspicious
 
-def Submitting_to_email(url):
-    r, soup = _get_soup(url)
-    if not soup:
-        return 0
-    return 1 if soup.find(href=lambda href: href and href.startswith("mailto:")) else 0
+def Submitting_to_email(url, context=None):
+    signals = _get_signals(url, context)
+    return 1 if signals and signals.has_mailto else 0
 
-def on_mouseover(url):
-    r, soup = _get_soup(url)
-    if not soup:
-        return 0
-    return 1 if soup.find(attrs={"onmouseover": True}) else 0
+def on_mouseover(url, context=None):
+    signals = _get_signals(url, context)
+    return 1 if signals and signals.has_onmouseover else 0
 
-def RightClick(url):
-    r, soup = _get_soup(url)
-    if not soup:
+def RightClick(url, context=None):
+    signals = _get_signals(url, context)
+    if not signals:
         return 0
-    if soup.find(attrs={"oncontextmenu": True}):
-        return 1
-    r_text = r.text.lower() if r else ""
-    return 1 if ("event.button==2" in r_text or ("preventdefault" in r_text and "contextmenu" in r_text)) else 0
+    return 1 if signals.has_oncontextmenu or signals.has_contextmenu_script else 0
 
-def popUpWidnow(url):
-    r, soup = _get_soup(url)
-    if not soup:
-        return 0
-    return 1 if "window.open" in (r.text if r else "") else 0
+def popUpWidnow(url, context=None):
+    signals = _get_signals(url, context)
+    return 1 if signals and signals.has_window_open else 0
 
-def Iframe(url):
-    r, soup = _get_soup(url)
-    if not soup:
-        return 0
-    return 1 if soup.find_all("iframe") else 0
+def Iframe(url, context=None):
+    signals = _get_signals(url, context)
+    return 1 if signals and signals.iframe_count > 0 else 0
 
 # ---------- DNS & Domain ----------
-def DNSRecord(url):
-    parsed = tldextract.extract(url)
-    domain = parsed.registered_domain
-    try:
-        answers = dns.resolver.resolve(domain, 'A')
-        return 1 if answers else 0
-    except:
-        return 0
+def DNSRecord(url, context=None):
+    return 1 if _context(url, context).addresses else 0
 
-def Abnormal_URL(url):
-    parsed = tldextract.extract(url)
-    domain = parsed.registered_domain
-    if not domain:
+def Abnormal_URL(url, context=None):
+    context = _context(url, context)
+    if not context.registered_domain:
         return 1
     try:
-        w = whois.whois(domain)
+        w = context.whois
         return 0 if w.domain_name else 1
     except:
         return 1
 
-def Redirect(url):
-    try:
-        r = requests.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT, allow_redirects=True)
-        return len(r.history)
-    except:
+def Redirect(url, context=None):
+    r = _context(url, context).response
+    if r is None:
         return -1
+    return len(r.history)
 
 # ---------- Misc / Placeholder ----------
 def port(url):
@@ -237,42 +403,139 @@ def Google_Index(url):
 def Links_pointing_to_page(url):
     return -1
 
-def Statistical_report(url):
-    features = extract_all_features(url)
+def Statistical_report(url, context=None, features=None):
+    """
+    Counts the suspicious signals among the other features. Pass the features already
+    extracted for this URL, otherwise they are extracted here.
+    """
+    if features is None:
+        features = extract_all_features(url, context)
+        features.pop("Statistical_report")
     suspicious_count = sum(1 for k,v in features.items() if isinstance(v,(int,float)) and v and v!=-1)
     return suspicious_count
 
 # ---------- Composite Feature Extraction ----------
-def extract_all_features(url):
-    return {
+def extract_all_features(url, context=None):
+    context = _context(url, context)
+    features = {
         "having_IP_Address": having_IP_Address(url),
         "URL_Length": URL_Length(url),
         "Shortining_Service": Shortining_Service(url),
         "having_At_Symbol": having_At_Symbol(url),
         "double_slash_redirecting": double_slash_redirecting(url),
-        "Prefix_Suffix": Prefix_Suffix(url),
-        "having_Sub_Domain": having_Sub_Domain(url),
-        "SSLfinal_State": SSLfinal_State(url),
-        "Domain_registeration_length": Domain_registeration_length(url),
-        "Favicon": Favicon(url),
+        "Prefix_Suffix": Prefix_Suffix(url, context),
+        "having_Sub_Domain": having_Sub_Domain(url, context),
+        "SSLfinal_State": SSLfinal_State(url, context),
+        "Domain_registeration_length": Domain_registeration_length(url, context),
+        "Favicon": Favicon(url, context),
         "port": port(url),
         "HTTPS_token": HTTPS_token(url),
-        "Request_URL": Request_URL(url),
-        "URL_of_Anchor": URL_of_Anchor(url),
-        "Links_in_tags": Links_in_tags(url),
-        "SFH": SFH(url),
-        "Submitting_to_email": Submitting_to_email(url),
-        "Abnormal_URL": Abnormal_URL(url),
-        "Redirect": Redirect(url),
-        "on_mouseover": on_mouseover(url),
-        "RightClick": RightClick(url),
-        "popUpWidnow": popUpWidnow(url),
-        "Iframe": Iframe(url),
-        "age_of_domain": age_of_domain(url),
-        "DNSRecord": DNSRecord(url),
+        "Request_URL": Request_URL(url, context),
+        "URL_of_Anchor": URL_of_Anchor(url, context),
+        "Links_in_tags": Links_in_tags(url, context),
+        "SFH": SFH(url, context),
+        "Submitting_to_email": Submitting_to_email(url, context),
+        "Abnormal_URL": Abnormal_URL(url, context),
+        "Redirect": Redirect(url, context),
+        "on_mouseover": on_mouseover(url, context),
+        "RightClick": RightClick(url, context),
+        "popUpWidnow": popUpWidnow(url, context),
+        "Iframe": Iframe(url, context),
+        "age_of_domain": age_of_domain(url, context),
+        "DNSRecord": DNSRecord(url, context),
         "web_traffic": web_traffic(url),
         "Page_Rank": Page_Rank(url),
         "Google_Index": Google_Index(url),
         "Links_pointing_to_page": Links_pointing_to_page(url),
-        "Statistical_report": Statistical_report(url)
     }
+    features["Statistical_report"] = Statistical_report(url, context, features)
+    return features
+
+# ---------- Deadline Bounded Extraction ----------
+LEXICAL_FEATURES = {
+    "having_IP_Address": having_IP_Address,
+    "URL_Length": URL_Length,
+    "Shortining_Service": Shortining_Service,
+    "having_At_Symbol": having_At_Symbol,
+    "double_slash_redirecting": double_slash_redirecting,
+    "port": port,
+    "HTTPS_token": HTTPS_token,
+    "web_traffic": web_traffic,
+    "Page_Rank": Page_Rank,
+    "Google_Index": Google_Index,
+    "Links_pointing_to_page": Links_pointing_to_page,
+}
+
+## placeholders that are always -1 at serving time, a model cannot learn from them here
+UNAVAILABLE_FEATURES = ["web_traffic", "Page_Rank", "Google_Index", "Links_pointing_to_page"]
+
+DOMAIN_FEATURES = [Prefix_Suffix, having_Sub_Domain]
+
+## features that share a network probe, each group runs as one task
+PROBE_GROUPS = {
+    "page": [Favicon, Request_URL, URL_of_Anchor, Links_in_tags, SFH, Submitting_to_email,
+             Redirect, on_mouseover, RightClick, popUpWidnow, Iframe],
+    "whois": [Domain_registeration_length, Abnormal_URL, age_of_domain],
+    "dns": [DNSRecord],
+    "tls": [SSLfinal_State],
+}
+
+_probe_executor = None
+_probe_executor_lock = threading.Lock()
+
+def get_probe_executor():
+    global _probe_executor
+    with _probe_executor_lock:
+        if _probe_executor is None:
+            _probe_executor = ThreadPoolExecutor(max_workers=PROBE_WORKERS, thread_name_prefix="probe")
+        return _probe_executor
+
+def _run_probe_group(url, context, feature_fns):
+    return {fn.__name__: fn(url, context) for fn in feature_fns}
+
+def extract_features_with_deadline(url, context=None, deadline_seconds=URL_DEADLINE_SECONDS, executor=None,
+                                   probe_groups=None):
+    """
+    extract_all_features bounded by one total deadline for the URL.
+
+    The probe groups run concurrently on executor. Features whose probe has not finished
+    when the deadline passes are NaN, so the preprocessor imputes them. probe_groups limits
+    the probes to the named PROBE_GROUPS, the features of the other groups are NaN
+    without being reported as degraded.
+    return: (features, names of the degraded features)
+    """
+    start = time.monotonic()
+    if context is None:
+        context = PageContext(url, timeout=min(REQUEST_TIMEOUT, deadline_seconds))
+    executor = executor if executor is not None else get_probe_executor()
+    ## parse the domain before the probes start so they share one parse
+    features = {name: fn(url) for name, fn in LEXICAL_FEATURES.items()}
+    features.update(_run_probe_group(url, context, DOMAIN_FEATURES))
+    probe_groups = list(PROBE_GROUPS) if probe_groups is None else probe_groups
+    futures = {}
+    for group, feature_fns in PROBE_GROUPS.items():
+        if group in probe_groups:
+            futures[executor.submit(_run_probe_group, url, context, feature_fns)] = feature_fns
+        else:
+            features.update({fn.__name__: float("nan") for fn in feature_fns})
+    done, _ = wait(futures, timeout=max(0.0, deadline_seconds - (time.monotonic() - start)))
+
+    degraded = []
+    for future, feature_fns in futures.items():
+        if future in done and future.exception() is None:
+            features.update(future.result())
+            continue
+        ## probes past the deadline keep running in the background, their result is dropped
+        future.cancel()
+        for fn in feature_fns:
+            features[fn.__name__] = float("nan")
+            degraded.append(fn.__name__)
+
+    if degraded or len(futures) < len(PROBE_GROUPS):
+        ## a count over a partial vector would look less suspicious than it is
+        features["Statistical_report"] = float("nan")
+        if degraded:
+            degraded.append("Statistical_report")
+    else:
+        features["Statistical_report"] = Statistical_report(url, context, features)
+    return features, degraded
@@ -0,0 +1,208 @@
+import gzip
+import json
+import os
+import socket
+import ssl
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import requests
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.whois_cache import WhoisRecord, get_default_whois_cache
+
+FETCH = "fetch"
+RESOLVE = "resolve"
+WHOIS = "whois"
+TLS = "tls"
+PROBE_KINDS = (FETCH, RESOLVE, WHOIS, TLS)
+
+
+@dataclass
+class FetchedPage:
+    """
+    The parts of an HTTP response the features read. history holds the redirect URLs,
+    so len(history) matches requests.Response.history.
+    """
+    url: str
+    status_code: int
+    text: str
+    history: List[str] = field(default_factory=list)
+
+
+class LiveTransport:
+    """
+    Talks to the network: HTTP through requests, DNS through the caching resolver,
+    WHOIS through the shared WhoisCache and TLS through a direct socket handshake.
+    """
+    def __init__(self, resolver, session=None, whois_cache=None, headers=None):
+        self.resolver = resolver
+        self.session = session
+        self.whois_cache = whois_cache if whois_cache is not None else get_default_whois_cache()
+        self.headers = headers
+
+    def fetch(self, url: str, timeout: float) -> Optional[FetchedPage]:
+        try:
+            http = self.session if self.session is not None else requests
+            r = http.get(url, headers=self.headers, timeout=timeout, allow_redirects=True)
+            return FetchedPage(url=r.url, status_code=r.status_code, text=r.text,
+                               history=[h.url for h in r.history])
+        except Exception:
+            return None
+
+    def resolve(self, host: str) -> Optional[List[str]]:
+        return self.resolver.resolve(host)
+
+    def whois(self, domain: str) -> Optional[WhoisRecord]:
+        return self.whois_cache.lookup(domain)
+
+    def tls_probe(self, host: str, address: str, timeout: float) -> bool:
+        try:
+            ctx = ssl.create_default_context()
+            with ctx.wrap_socket(socket.socket(), server_hostname=host) as s:
+                s.settimeout(timeout)
+                ## connect to the address DNSRecord already resolved, SNI still carries the host name
+                s.connect((address, 443))
+                cert = s.getpeercert()
+            return bool(cert)
+        except Exception:
+            return False
+
+
+def _encode(kind: str, value):
+    if value is None:
+        return None
+    if kind == FETCH:
+        return asdict(value)
+    if kind == WHOIS:
+        return {key: (item.isoformat() if isinstance(item, datetime) else item)
+                for key, item in asdict(value).items()}
+    return value
+
+
+def _decode(kind: str, payload):
+    if payload is None:
+        return None
+    if kind == FETCH:
+        return FetchedPage(**payload)
+    if kind == WHOIS:
+        return WhoisRecord(domain_name=payload["domain_name"],
+                           creation_date=datetime.fromisoformat(payload["creation_date"]) if payload["creation_date"] else None,
+                           expiration_date=datetime.fromisoformat(payload["expiration_date"]) if payload["expiration_date"] else None)
+    return payload
+
+
+class FixtureStore:
+    """
+    Recorded probe answers keyed by probe kind and target, kept in one gzipped JSON file.
+
+    Failed probes are recorded as well, so a replay fails exactly where the recording did.
+    """
+    def __init__(self, file_path: str):
+        try:
+            self.file_path = file_path
+            self._fixtures: Dict[str, dict] = {kind: {} for kind in PROBE_KINDS}
+            self._lock = threading.Lock()
+            if os.path.exists(file_path):
+                with gzip.open(file_path, "rt", encoding="utf-8") as file_obj:
+                    self._fixtures.update(json.load(file_obj))
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._fixtures.values())
+
+    def urls(self) -> List[str]:
+        return list(self._fixtures[FETCH])
+
+    def put(self, kind: str, key: str, value):
+        with self._lock:
+            self._fixtures[kind][key] = _encode(kind, value)
+
+    def has(self, kind: str, key: str) -> bool:
+        return key in self._fixtures[kind]
+
+    def get(self, kind: str, key: str):
+        return _decode(kind, self._fixtures[kind][key])
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+            tmp_file_path = f"{self.file_path}.tmp"
+            with self._lock, gzip.open(tmp_file_path, "wt", encoding="utf-8") as file_obj:
+                json.dump(self._fixtures, file_obj)
+            os.replace(tmp_file_path, self.file_path)
+            logging.info(f"Saved {len(self)} fixtures to {self.file_path}")
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+
+class RecordingTransport:
+    """
+    Passes every probe to another transport and records its answer in a FixtureStore
+    """
+    def __init__(self, transport, fixture_store: FixtureStore):
+        self.transport = transport
+        self.fixture_store = fixture_store
+
+    def fetch(self, url: str, timeout: float) -> Optional[FetchedPage]:
+        page = self.transport.fetch(url, timeout)
+        self.fixture_store.put(FETCH, url, page)
+        return page
+
+    def resolve(self, host: str) -> Optional[List[str]]:
+        addresses = self.transport.resolve(host)
+        self.fixture_store.put(RESOLVE, host, addresses)
+        return addresses
+
+    def whois(self, domain: str) -> Optional[WhoisRecord]:
+        record = self.transport.whois(domain)
+        self.fixture_store.put(WHOIS, domain, record)
+        return record
+
+    def tls_probe(self, host: str, address: str, timeout: float) -> bool:
+        has_certificate = self.transport.tls_probe(host, address, timeout)
+        self.fixture_store.put(TLS, host, has_certificate)
+        return has_certificate
+
+
+class ReplayTransport:
+    """
+    Serves recorded answers without touching the network.
+
+    latency_seconds: optional delay per probe kind, e.g. {"fetch": 0.3, "whois": 1.0},
+                     to replay realistic timings deterministically
+    strict: raise KeyError for a probe that was never recorded instead of treating it as failed
+    """
+    def __init__(self, fixture_store: FixtureStore, latency_seconds: Optional[Dict[str, float]] = None,
+                 strict: bool = False):
+        self.fixture_store = fixture_store
+        self.latency_seconds = latency_seconds or {}
+        self.strict = strict
+
+    def _replay(self, kind: str, key: str, default):
+        delay = self.latency_seconds.get(kind, 0)
+        if delay:
+            time.sleep(delay)
+        if not self.fixture_store.has(kind, key):
+            if self.strict:
+                raise KeyError(f"No recorded {kind} fixture for {key}")
+            return default
+        return self.fixture_store.get(kind, key)
+
+    def fetch(self, url: str, timeout: float) -> Optional[FetchedPage]:
+        return self._replay(FETCH, url, None)
+
+    def resolve(self, host: str) -> Optional[List[str]]:
+        return self._replay(RESOLVE, host, None)
+
+    def whois(self, domain: str) -> Optional[WhoisRecord]:
+        return self._replay(WHOIS, domain, None)
+
+    def tls_probe(self, host: str, address: str, timeout: float) -> bool:
+        return self._replay(TLS, host, False)
@@ -0,0 +1,81 @@
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import List, Optional
+
+RESOURCE_TAGS = ("img", "script", "link")
+LINKS_IN_TAGS = ("link", "meta", "script")
+
+
+@dataclass
+class PageSignals:
+    """
+    What the HTML features need to know about a page
+    """
+    found_icon_link: bool = False
+    icon_href: Optional[str] = None
+    resources: List[str] = field(default_factory=list)
+    anchor_hrefs: List[str] = field(default_factory=list)
+    links_in_tags: int = 0
+    form_actions: List[str] = field(default_factory=list)
+    has_mailto: bool = False
+    has_onmouseover: bool = False
+    has_oncontextmenu: bool = False
+    iframe_count: int = 0
+    has_window_open: bool = False
+    has_contextmenu_script: bool = False
+
+
+class PageSignalCollector(HTMLParser):
+    """
+    Collects every HTML feature signal in a single tokenizer pass without building a DOM.
+
+    Attributes written without a value (<a href>) are recorded as "", which is what
+    BeautifulSoup reported for them.
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.signals = PageSignals()
+
+    def handle_starttag(self, tag, attrs):
+        attributes = {name: (value if value is not None else "") for name, value in attrs}
+        signals = self.signals
+
+        href = attributes.get("href")
+        if tag == "link" and not signals.found_icon_link and "icon" in attributes.get("rel", "").lower():
+            signals.found_icon_link = True
+            signals.icon_href = href
+        if tag in RESOURCE_TAGS:
+            resource = attributes.get("src") or href
+            if resource:
+                signals.resources.append(resource)
+        if tag in LINKS_IN_TAGS and href is not None:
+            signals.links_in_tags += 1
+        if tag == "a" and href is not None:
+            signals.anchor_hrefs.append(href)
+        if tag == "form" and "action" in attributes:
+            signals.form_actions.append(attributes["action"])
+        if tag == "iframe":
+            signals.iframe_count += 1
+        if href and href.startswith("mailto:"):
+            signals.has_mailto = True
+        if "onmouseover" in attributes:
+            signals.has_onmouseover = True
+        if "oncontextmenu" in attributes:
+            signals.has_oncontextmenu = True
+
+
+def collect_page_signals(html: str) -> PageSignals:
+    collector = PageSignalCollector()
+    try:
+        collector.feed(html)
+        collector.close()
+    except Exception:
+        ## keep whatever was collected before the markup became unparseable
+        pass
+    signals = collector.signals
+    html_lower = html.lower()
+    signals.has_window_open = "window.open" in html
+    signals.has_contextmenu_script = "event.button==2" in html_lower or (
+        "preventdefault" in html_lower and "contextmenu" in html_lower
+    )
+    return signals
@@ -0,0 +1,147 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.feature_extraction import SHORTENERS_REGEX, _extract_host
+
+LEXICAL_FEATURE_COLUMNS = [
+    "having_IP_Address",
+    "URL_Length",
+    "Shortining_Service",
+    "having_At_Symbol",
+    "double_slash_redirecting",
+    "Prefix_Suffix",
+    "having_Sub_Domain",
+    "port",
+    "HTTPS_token",
+]
+
+## flags fit in int8, the three count-like features keep the values the scalar functions return
+LEXICAL_FEATURE_DTYPES = {column: np.int8 for column in LEXICAL_FEATURE_COLUMNS}
+LEXICAL_FEATURE_DTYPES.update({"URL_Length": np.int32, "having_Sub_Domain": np.int16, "port": np.int32})
+
+IP_ADDRESS_PATTERN = r"http[s]?://\d+\.\d+\.\d+\.\d+"
+
+## the dataset codes every feature as 1 legitimate, 0 suspicious and -1 phishing
+LEXICAL_FLAG_COLUMNS = [
+    "having_IP_Address",
+    "Shortining_Service",
+    "having_At_Symbol",
+    "double_slash_redirecting",
+    "Prefix_Suffix",
+    "HTTPS_token",
+]
+URL_LENGTH_LEGITIMATE_BELOW = 54
+URL_LENGTH_SUSPICIOUS_UP_TO = 75
+STANDARD_PORTS = (80, 443)
+
+
+def _as_url_series(urls) -> pd.Series:
+    ## Arrow arrays and chunked arrays convert without copying the strings twice
+    if hasattr(urls, "to_pandas"):
+        urls = urls.to_pandas()
+    urls = pd.Series(urls, dtype=object) if not isinstance(urls, pd.Series) else urls
+    return urls.fillna("").astype(str).reset_index(drop=True)
+
+
+def _hosts(urls: pd.Series) -> pd.Series:
+    """
+    Vectorized feature_extraction._host_of
+    """
+    netloc = urls.str.split("://", n=1).str[-1]
+    protocol_relative = ~urls.str.contains("://", regex=False) & netloc.str.startswith("//")
+    netloc = netloc.where(~protocol_relative, netloc.str[2:])
+    netloc = netloc.str.split(r"[/?#]", n=1, regex=True).str[0]
+    netloc = netloc.str.rsplit("@", n=1).str[-1]
+    return netloc.where(netloc.str.startswith("["), netloc.str.split(":", n=1).str[0])
+
+
+def _domain_features(urls: pd.Series):
+    """
+    Prefix_Suffix and having_Sub_Domain, parsing each distinct host once
+    """
+    codes, unique_hosts = pd.factorize(_hosts(urls))
+    prefix_suffix = np.zeros(len(unique_hosts), dtype=np.int8)
+    sub_domains = np.zeros(len(unique_hosts), dtype=np.int16)
+    for index, host in enumerate(unique_hosts):
+        parsed = _extract_host(host)
+        prefix_suffix[index] = "-" in parsed.domain
+        sub_domains[index] = parsed.subdomain.count(".") + 1 if parsed.subdomain else 0
+    return prefix_suffix[codes], sub_domains[codes]
+
+
+def _ports(urls: pd.Series) -> np.ndarray:
+    explicit = pd.to_numeric(urls.str.extract(r":(\d+)", expand=False), errors="coerce")
+    default = np.where(urls.str.startswith("http://"), 80, 443)
+    ports = np.where(explicit.isna(), default, explicit.to_numpy(dtype=float))
+    return np.minimum(ports, np.iinfo(np.int32).max)
+
+
+def encode_lexical_features(features: pd.DataFrame) -> pd.DataFrame:
+    """
+    Scalar feature values in the dataset's -1/0/1 coding, as int8
+    """
+    try:
+        encoded = pd.DataFrame({column: np.where(features[column] != 0, -1, 1)
+                                for column in LEXICAL_FLAG_COLUMNS})
+        url_length = features["URL_Length"].to_numpy()
+        encoded["URL_Length"] = np.select(
+            [url_length < URL_LENGTH_LEGITIMATE_BELOW, url_length <= URL_LENGTH_SUSPICIOUS_UP_TO], [1, 0], -1)
+        sub_domains = features["having_Sub_Domain"].to_numpy()
+        encoded["having_Sub_Domain"] = np.select([sub_domains == 0, sub_domains == 1], [1, 0], -1)
+        encoded["port"] = np.where(np.isin(features["port"].to_numpy(), STANDARD_PORTS), 1, -1)
+        return encoded[LEXICAL_FEATURE_COLUMNS].astype(np.int8)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def extract_lexical_features(urls, ternary: bool = False) -> pd.DataFrame:
+    """
+    The pure string features of many URLs at once, without any network access.
+
+    urls: pandas Series, list or pyarrow array of URLs
+    ternary: code the features like the dataset the model is trained on
+    return: one row per URL in LEXICAL_FEATURE_COLUMNS order. With ternary every column
+            is int8, otherwise the columns have LEXICAL_FEATURE_DTYPES and hold the same
+            values the scalar feature functions return
+    """
+    try:
+        urls = _as_url_series(urls)
+        prefix_suffix, sub_domains = _domain_features(urls)
+        hosts_after_scheme = urls.str.split("://").str[-1].str.split("/").str[0]
+        features = pd.DataFrame({
+            "having_IP_Address": urls.str.match(IP_ADDRESS_PATTERN),
+            "URL_Length": urls.str.len(),
+            "Shortining_Service": urls.str.contains(SHORTENERS_REGEX, regex=True),
+            "having_At_Symbol": urls.str.contains("@", regex=False),
+            "double_slash_redirecting": urls.str.split("://", n=1).str[-1].str.contains("//", regex=False),
+            "Prefix_Suffix": prefix_suffix,
+            "having_Sub_Domain": sub_domains,
+            "port": _ports(urls),
+            "HTTPS_token": hosts_after_scheme.str.lower().str.contains("https", regex=False),
+        })
+        features = features.astype(LEXICAL_FEATURE_DTYPES)
+        return encode_lexical_features(features) if ternary else features
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def extract_lexical_matrix(urls, chunk_size: int = 1_000_000) -> np.ndarray:
+    """
+    Lexical features as one compact int8 matrix for pre-screening very large URL lists,
+    coded -1/0/1 like the model's features. Use extract_lexical_features for the values
+    the scalar functions return.
+    """
+    try:
+        urls = _as_url_series(urls)
+        matrix = np.empty((len(urls), len(LEXICAL_FEATURE_COLUMNS)), dtype=np.int8)
+        for start in range(0, len(urls), chunk_size):
+            features = extract_lexical_features(urls.iloc[start:start + chunk_size], ternary=True)
+            matrix[start:start + len(features)] = features.to_numpy()
+        logging.info(f"Extracted lexical features of {len(urls)} URLs")
+        return matrix
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
@@ -0,0 +1,94 @@
+import os
+import sys
+import threading
+from typing import Optional
+
+import certifi
+import pymongo
+from dotenv import load_dotenv
+
+from networksecurity.constant.training_pipeline import (
+    MONGO_CLIENT_CONNECT_TIMEOUT_MS,
+    MONGO_CLIENT_MAX_POOL_SIZE,
+    MONGO_CLIENT_SERVER_SELECTION_TIMEOUT_MS,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+load_dotenv()
+
+_client: Optional[pymongo.MongoClient] = None
+_client_pid: Optional[int] = None
+_client_lock = threading.Lock()
+
+
+def get_mongo_url() -> Optional[str]:
+    return os.getenv("MONGODB_URL_KEY") or os.getenv("MONGO_URL_KEY")
+
+
+def _reset_after_fork():
+    ## a client must not cross a fork, the child builds its own on first use
+    global _client, _client_pid, _client_lock
+    _client = None
+    _client_pid = None
+    _client_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_mongo_client(max_pool_size: Optional[int] = None) -> pymongo.MongoClient:
+    """
+    The process wide MongoClient, created on first use.
+
+    connect=False defers connecting to the first operation, so importing or starting the
+    API never waits for MongoDB. Each process (uvicorn worker, forked child) gets its own
+    client and pool. max_pool_size only applies to the call that creates the client.
+    """
+    global _client, _client_pid
+    try:
+        if _client is not None and _client_pid == os.getpid():
+            return _client
+        with _client_lock:
+            if _client is None or _client_pid != os.getpid():
+                mongo_url = get_mongo_url()
+                if not mongo_url:
+                    logging.warning("MONGODB_URL_KEY is not set, using a local mongod")
+                    mongo_url = "mongodb://localhost:27017"
+                options = {
+                    "maxPoolSize": max_pool_size or int(os.getenv("MONGO_CLIENT_MAX_POOL_SIZE", MONGO_CLIENT_MAX_POOL_SIZE)),
+                    "serverSelectionTimeoutMS": MONGO_CLIENT_SERVER_SELECTION_TIMEOUT_MS,
+                    "connectTimeoutMS": MONGO_CLIENT_CONNECT_TIMEOUT_MS,
+                    "connect": False,
+                }
+                ## Atlas needs the certifi CA bundle, a plain local mongod has no TLS
+                if mongo_url.startswith("mongodb+srv://") or "tls=true" in mongo_url or "ssl=true" in mongo_url:
+                    options["tlsCAFile"] = certifi.where()
+                _client = pymongo.MongoClient(mongo_url, **options)
+                _client_pid = os.getpid()
+                logging.info(f"Created MongoDB client with a pool of {options['maxPoolSize']} connections")
+            return _client
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def ping_mongo() -> bool:
+    """
+    True when MongoDB answers a ping within the server selection timeout
+    """
+    try:
+        get_mongo_client().admin.command("ping")
+        return True
+    except Exception as e:
+        logging.warning(f"MongoDB health check failed: {str(e)}")
+        return False
+
+
+def close_mongo_client():
+    global _client, _client_pid
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
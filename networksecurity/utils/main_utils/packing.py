@@ -0,0 +1,171 @@
+import os
+import struct
+import sys
+from typing import Tuple
+
+import numpy as np
+
+from networksecurity.exception.exception import NetworkSecurityException
+
+## every feature is ternary, so a value takes 2 bits: -1 -> 0, 0 -> 1, 1 -> 2, missing -> 3
+BITS_PER_VALUE = 2
+MISSING_CODE = 3
+MAX_PACKED_COLUMNS = 64 // BITS_PER_VALUE
+## int8 stand-in for a missing value, it is never a feature value
+INT8_MISSING = np.iinfo(np.int8).min
+## fixed .npy header size, so the row count can be rewritten in place once the file is complete
+NPY_HEADER_LENGTH = 128
+
+
+def _pack_codes(codes: np.ndarray) -> np.ndarray:
+    shifts = np.arange(codes.shape[1], dtype=np.uint64) * np.uint64(BITS_PER_VALUE)
+    return np.bitwise_or.reduce(codes.astype(np.uint64) << shifts, axis=1)
+
+
+def pack_rows(values) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pack each row of {-1, 0, 1, NaN} values into a single uint64, column i in bits 2i..2i+1.
+
+    values: 2-D array like with at most 32 columns
+    return: (packed uint64 per row, boolean mask of rows that could be packed).
+            Rows holding any other value are not packable and get 0.
+    """
+    try:
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            values = values.reshape(1, -1)
+        if values.shape[1] > MAX_PACKED_COLUMNS:
+            raise ValueError(f"Cannot pack {values.shape[1]} columns into 64 bits, the limit is {MAX_PACKED_COLUMNS}")
+
+        missing = np.isnan(values)
+        packable = (missing | (values == -1) | (values == 0) | (values == 1)).all(axis=1)
+        codes = np.where(missing, MISSING_CODE, values + 1)
+        codes[~packable] = 0
+        return _pack_codes(codes), packable
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def pack_int8_rows(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    pack_rows for int8 rows that mark missing values with INT8_MISSING, without a float copy
+    """
+    try:
+        values = np.asarray(values, dtype=np.int8)
+        if values.shape[1] > MAX_PACKED_COLUMNS:
+            raise ValueError(f"Cannot pack {values.shape[1]} columns into 64 bits, the limit is {MAX_PACKED_COLUMNS}")
+        missing = values == INT8_MISSING
+        packable = (missing | ((values >= -1) & (values <= 1))).all(axis=1)
+        codes = np.where(missing, MISSING_CODE, values + 1).astype(np.uint8)
+        codes[~packable] = 0
+        return _pack_codes(codes), packable
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def unpack_int8_rows(packed: np.ndarray, number_of_columns: int) -> np.ndarray:
+    """
+    Inverse of pack_int8_rows, missing values come back as INT8_MISSING
+    """
+    try:
+        packed = np.asarray(packed, dtype=np.uint64)
+        shifts = np.arange(number_of_columns, dtype=np.uint64) * np.uint64(BITS_PER_VALUE)
+        codes = ((packed[:, None] >> shifts) & np.uint64(MISSING_CODE)).astype(np.int8)
+        return np.where(codes == MISSING_CODE, INT8_MISSING, codes - 1).astype(np.int8)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+class PackedRowWriter:
+    """
+    Writes packed rows to a 1-D uint64 .npy file batch by batch, so the whole dataset is
+    never held in memory. The header is written with a placeholder row count and
+    rewritten on close. A new file only appears at file_path once it is complete, use
+    open_for_append to extend an existing one in place.
+    """
+    def __init__(self, file_path: str):
+        try:
+            self.file_path = file_path
+            self.temp_file_path = f"{file_path}.tmp"
+            self.number_of_rows = 0
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+            self._file_obj = open(self.temp_file_path, "wb")
+            self._write_header()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    @classmethod
+    def open_for_append(cls, file_path: str, number_of_rows: int) -> "PackedRowWriter":
+        """
+        Continue a packed file after its first number_of_rows rows. Rows past that point,
+        left by a run that stopped before recording them, are dropped.
+        """
+        try:
+            if not os.path.exists(file_path):
+                if number_of_rows:
+                    raise ValueError(f"{file_path} is missing but {number_of_rows} rows were expected")
+                return cls(file_path)
+            with open(file_path, "rb") as file_obj:
+                version = np.lib.format.read_magic(file_obj)
+                if version == (1, 0):
+                    shape, _, dtype = np.lib.format.read_array_header_1_0(file_obj)
+                else:
+                    shape, _, dtype = np.lib.format.read_array_header_2_0(file_obj)
+                data_offset = file_obj.tell()
+            if dtype != np.dtype("<u8") or len(shape) != 1 or shape[0] < number_of_rows:
+                raise ValueError(f"{file_path} holds {shape} {dtype}, expected at least {number_of_rows} packed rows")
+
+            if data_offset != NPY_HEADER_LENGTH:
+                ## written by np.save, copy it once into the fixed header layout
+                existing = np.load(file_path, mmap_mode="r")
+                writer = cls(file_path)
+                writer.append(existing[:number_of_rows])
+                del existing
+                return writer
+
+            writer = cls.__new__(cls)
+            writer.file_path = file_path
+            writer.temp_file_path = None
+            writer.number_of_rows = number_of_rows
+            writer._file_obj = open(file_path, "r+b")
+            writer._file_obj.truncate(NPY_HEADER_LENGTH + number_of_rows * 8)
+            writer._file_obj.seek(0, os.SEEK_END)
+            return writer
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _write_header(self):
+        header = "{'descr': '<u8', 'fortran_order': False, 'shape': (%d,), }" % self.number_of_rows
+        prefix = np.lib.format.magic(1, 0) + struct.pack("<H", NPY_HEADER_LENGTH - 10)
+        self._file_obj.seek(0)
+        self._file_obj.write(prefix + header.ljust(NPY_HEADER_LENGTH - 11).encode("latin1") + b"\n")
+
+    def append(self, packed: np.ndarray):
+        self._file_obj.seek(0, os.SEEK_END)
+        self._file_obj.write(np.ascontiguousarray(packed, dtype="<u8").tobytes())
+        self.number_of_rows += len(packed)
+
+    def close(self):
+        try:
+            self._write_header()
+            self._file_obj.flush()
+            os.fsync(self._file_obj.fileno())
+            self._file_obj.close()
+            if self.temp_file_path is not None:
+                os.replace(self.temp_file_path, self.file_path)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def abort(self):
+        self._file_obj.close()
+        if self.temp_file_path is not None and os.path.exists(self.temp_file_path):
+            os.remove(self.temp_file_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,95 @@
+import io
+import sys
+from typing import List
+
+import numpy as np
+
+from networksecurity.constant.training_pipeline import (
+    PREDICTION_OUTPUT_COLUMN,
+    SCHEMA_FILE_PATH,
+    TARGET_COLUMN,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils.main_utils.utils import get_schema_columns
+
+NPY_CONTENT_TYPE = "application/x-npy"
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+INT8_CONTENT_TYPE = "application/octet-stream"
+BINARY_CONTENT_TYPES = (NPY_CONTENT_TYPE, ARROW_CONTENT_TYPE, INT8_CONTENT_TYPE)
+
+
+def get_feature_columns(schema_file_path: str = SCHEMA_FILE_PATH) -> List[str]:
+    """
+    Feature columns in schema order, without the target column
+    """
+    try:
+        return [column for column in get_schema_columns(schema_file_path) if column != TARGET_COLUMN]
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def _read_arrow_table(body: bytes, feature_columns: List[str]) -> np.ndarray:
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError("pyarrow is required for Arrow IPC payloads, install it with pip install pyarrow")
+
+    table = pa.ipc.open_stream(body).read_all()
+    missing_columns = [column for column in feature_columns if column not in table.column_names]
+    if missing_columns:
+        raise ValueError(f"Arrow payload is missing columns: {missing_columns}")
+    return np.column_stack([table.column(column).to_numpy() for column in feature_columns])
+
+
+def decode_feature_payload(body: bytes, content_type: str, feature_columns: List[str]) -> np.ndarray:
+    """
+    Turn a binary request body into a (rows, features) array without text parsing.
+
+    body: raw request bytes
+    content_type: one of BINARY_CONTENT_TYPES
+    feature_columns: expected columns from the schema, in order
+    """
+    try:
+        number_of_features = len(feature_columns)
+        if content_type == NPY_CONTENT_TYPE:
+            array = np.load(io.BytesIO(body), allow_pickle=False)
+        elif content_type == ARROW_CONTENT_TYPE:
+            array = _read_arrow_table(body, feature_columns)
+        elif content_type == INT8_CONTENT_TYPE:
+            if len(body) % number_of_features != 0:
+                raise ValueError(f"Packed int8 payload of {len(body)} bytes is not a multiple of {number_of_features} features")
+            array = np.frombuffer(body, dtype=np.int8).reshape(-1, number_of_features)
+        else:
+            raise ValueError(f"Unsupported content type: {content_type}, expected one of {BINARY_CONTENT_TYPES}")
+
+        if array.ndim == 1 and array.shape[0] == number_of_features:
+            array = array.reshape(1, -1)
+        if array.ndim != 2 or array.shape[1] != number_of_features:
+            raise ValueError(f"Expected shape (rows, {number_of_features}), got {array.shape}")
+        return array
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def encode_predictions(y_pred: np.ndarray, content_type: str) -> bytes:
+    """
+    Encode predictions as int8 in the same format the features arrived in
+    """
+    try:
+        y_pred = np.asarray(y_pred).astype(np.int8)
+        if content_type == NPY_CONTENT_TYPE:
+            buffer = io.BytesIO()
+            np.save(buffer, y_pred, allow_pickle=False)
+            return buffer.getvalue()
+        if content_type == ARROW_CONTENT_TYPE:
+            import pyarrow as pa
+            table = pa.table({PREDICTION_OUTPUT_COLUMN: y_pred})
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return sink.getvalue().to_pybytes()
+        if content_type == INT8_CONTENT_TYPE:
+            return y_pred.tobytes()
+        raise ValueError(f"Unsupported content type: {content_type}")
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
@@ -3,8 +3,12 @@ from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
 import os,sys
 import numpy as np
+import pandas as pd
 #import dill
 import pickle
+from typing import List
+
+from networksecurity.constant.training_pipeline import SCHEMA_FILE_PATH
 
 from sklearn.metrics import r2_score
 from sklearn.model_selection import GridSearchCV
@@ -27,6 +31,70 @@ def write_yaml_file(file_path: str, content: object, replace: bool = False) -> N
     except Exception as e:
         raise NetworkSecurityException(e, sys)
     
+def get_schema_columns(schema_file_path: str = SCHEMA_FILE_PATH) -> List[str]:
+    """
+    All columns of the schema, target included, in schema order
+    """
+    try:
+        schema = read_yaml_file(schema_file_path)
+        return [list(column.keys())[0] for column in schema["columns"]]
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+
+def get_schema_dtype(schema_file_path: str = SCHEMA_FILE_PATH) -> np.dtype:
+    """
+    On-disk dtype of the schema columns, the smallest one that holds all of them
+    """
+    try:
+        schema = read_yaml_file(schema_file_path)
+        return np.result_type(*[np.dtype(list(column.values())[0].strip()) for column in schema["columns"]])
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+
+def get_missing_value(dtype: np.dtype):
+    """
+    Stand-in for a missing value in a column of dtype: the smallest integer, or NaN for floats
+    """
+    dtype = np.dtype(dtype)
+    return np.iinfo(dtype).min if dtype.kind in "iu" else np.nan
+
+def save_columnar_array(file_path: str, array: np.array) -> None:
+    """
+    Save a 2-D array of schema columns, already in the schema dtype, in column order
+    """
+    try:
+        save_numpy_array_data(file_path, np.asfortranarray(array))
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+
+def load_columnar_dataframe(file_path: str) -> pd.DataFrame:
+    """
+    Open a file written by save_columnar_array memory-mapped, nothing is parsed or
+    copied until a column is used. Missing values keep the get_missing_value stand-in.
+    """
+    try:
+        columns = get_schema_columns()
+        array = load_numpy_array_data(file_path, mmap_mode="r")
+        if array.ndim != 2 or array.shape[1] != len(columns):
+            raise ValueError(f"{file_path} holds an array of shape {array.shape}, expected {len(columns)} columns")
+        return pd.DataFrame(array, columns=columns, copy=False)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+
+def to_float_with_nan(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    float32 copy of a columnar dataframe with its missing values as NaN, for the imputer
+    """
+    try:
+        values = dataframe.to_numpy()
+        missing_value = get_missing_value(values.dtype)
+        float_values = values.astype(np.float32)
+        if not np.isnan(missing_value):
+            float_values[values == missing_value] = np.nan
+        return pd.DataFrame(float_values, columns=dataframe.columns, index=dataframe.index)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+
 def save_numpy_array_data(file_path: str, array: np.array):
     """
     Save numpy array data to file
@@ -45,8 +113,11 @@ def save_object(file_path: str, obj: object) -> None:
     try:
         logging.info("Entered the save_object method of MainUtils class")
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "wb") as file_obj:
+        ## write next to the target and rename, so a reader never unpickles a half-written file
+        temp_file_path = f"{file_path}.tmp"
+        with open(temp_file_path, "wb") as file_obj:
             pickle.dump(obj, file_obj)
+        os.replace(temp_file_path, file_path)
         logging.info("Exited the save_object method of MainUtils class")
     except Exception as e:
         raise NetworkSecurityException(e, sys) from e
@@ -61,13 +132,16 @@ def load_object(file_path: str, ) -> object:
     except Exception as e:
         raise NetworkSecurityException(e, sys) from e
     
-def load_numpy_array_data(file_path: str) -> np.array:
+def load_numpy_array_data(file_path: str, mmap_mode: str = None) -> np.array:
     """
     load numpy array data from file
     file_path: str location of file to load
+    mmap_mode: "r" to map the file read-only instead of reading it into memory
     return: np.array data loaded
     """
     try:
+        if mmap_mode is not None:
+            return np.load(file_path, mmap_mode=mmap_mode)
         with open(file_path, "rb") as file_obj:
             return np.load(file_obj)
     except Exception as e:
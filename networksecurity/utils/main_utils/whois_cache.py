@@ -0,0 +1,168 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import whois
+
+from networksecurity.constant.training_pipeline import (
+    WHOIS_CACHE_FILE_PATH,
+    WHOIS_CACHE_NEGATIVE_TTL_SECONDS,
+    WHOIS_CACHE_TTL_SECONDS,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+
+@dataclass
+class WhoisRecord:
+    domain_name: Optional[str]
+    creation_date: Optional[datetime]
+    expiration_date: Optional[datetime]
+
+
+def _first(value):
+    ## python-whois returns a list when the registry reports several values
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def _to_text(value) -> Optional[str]:
+    if value is None:
+        return None
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def _to_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _only_datetime(value) -> Optional[datetime]:
+    ## python-whois hands back the raw string when it cannot parse a registry's date format
+    value = _first(value)
+    return value if isinstance(value, datetime) else None
+
+
+class WhoisCache:
+    """
+    WHOIS lookups cached in a SQLite file that every worker process shares.
+
+    Successful answers live for ttl_seconds, failed lookups (timeouts, rate limits)
+    for negative_ttl_seconds. Within a process concurrent callers for the same domain
+    wait for a single lookup. WAL mode lets workers read while another one writes.
+    """
+    def __init__(self, db_path: str = WHOIS_CACHE_FILE_PATH,
+                 ttl_seconds: float = WHOIS_CACHE_TTL_SECONDS,
+                 negative_ttl_seconds: float = WHOIS_CACHE_NEGATIVE_TTL_SECONDS):
+        try:
+            self.db_path = db_path
+            self.ttl_seconds = ttl_seconds
+            self.negative_ttl_seconds = negative_ttl_seconds
+            self._local = threading.local()
+            self._domain_locks = {}
+            self._domain_locks_guard = threading.Lock()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _connection(self) -> sqlite3.Connection:
+        ## one connection per thread and per process, sqlite connections must not cross a fork
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS whois_cache ("
+                "domain TEXT PRIMARY KEY, found INTEGER NOT NULL, domain_name TEXT, "
+                "creation_date TEXT, expiration_date TEXT, fetched_at REAL NOT NULL)"
+            )
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _domain_lock(self, domain: str) -> threading.Lock:
+        with self._domain_locks_guard:
+            return self._domain_locks.setdefault(domain, threading.Lock())
+
+    def _read(self, domain: str):
+        """
+        Returns (fresh entry found, record)
+        """
+        row = self._connection().execute(
+            "SELECT found, domain_name, creation_date, expiration_date, fetched_at FROM whois_cache WHERE domain = ?",
+            (domain,),
+        ).fetchone()
+        if row is None:
+            return False, None
+        found, domain_name, creation_date, expiration_date, fetched_at = row
+        ttl_seconds = self.ttl_seconds if found else self.negative_ttl_seconds
+        if time.time() - fetched_at > ttl_seconds:
+            return False, None
+        if not found:
+            return True, None
+        try:
+            return True, WhoisRecord(domain_name=domain_name,
+                                     creation_date=_to_datetime(creation_date),
+                                     expiration_date=_to_datetime(expiration_date))
+        except ValueError:
+            ## a date this version cannot decode, look the domain up again and overwrite it
+            return False, None
+
+    def _write(self, domain: str, record: Optional[WhoisRecord]):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO whois_cache VALUES (?, ?, ?, ?, ?, ?)",
+            (domain, int(record is not None),
+             _to_text(record.domain_name) if record else None,
+             _to_text(record.creation_date) if record else None,
+             _to_text(record.expiration_date) if record else None,
+             time.time()),
+        )
+
+    @staticmethod
+    def _fetch(domain: str) -> Optional[WhoisRecord]:
+        try:
+            w = whois.whois(domain)
+        except Exception as e:
+            logging.info(f"WHOIS lookup for {domain} failed: {str(e)}")
+            return None
+        return WhoisRecord(domain_name=_first(w.domain_name),
+                           creation_date=_only_datetime(w.creation_date),
+                           expiration_date=_only_datetime(w.expiration_date))
+
+    def lookup(self, domain: str) -> Optional[WhoisRecord]:
+        """
+        Parsed WHOIS record of a registered domain, None when the lookup failed
+        """
+        if not domain:
+            return None
+        try:
+            fresh, record = self._read(domain)
+            if fresh:
+                return record
+            with self._domain_lock(domain):
+                ## another thread may have finished the lookup while we waited
+                fresh, record = self._read(domain)
+                if fresh:
+                    return record
+                record = self._fetch(domain)
+                self._write(domain, record)
+                return record
+        except sqlite3.Error as e:
+            logging.warning(f"WHOIS cache unavailable, querying {domain} directly: {str(e)}")
+            return self._fetch(domain)
+
+
+_default_whois_cache = None
+
+
+def get_default_whois_cache() -> WhoisCache:
+    global _default_whois_cache
+    if _default_whois_cache is None:
+        _default_whois_cache = WhoisCache()
+    return _default_whois_cache
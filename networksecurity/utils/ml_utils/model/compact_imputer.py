@@ -0,0 +1,143 @@
+import sys
+import time
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.metrics.pairwise import nan_euclidean_distances
+from sklearn.utils.validation import FLOAT_DTYPES, check_is_fitted
+
+from networksecurity.exception.exception import NetworkSecurityException
+
+## receiver rows per distance matrix, bounds it to rows * distinct reference rows floats
+IMPUTATION_CHUNK_SIZE = 1024
+
+
+class CompactKNNImputer(TransformerMixin, BaseEstimator):
+    """
+    KNNImputer that keeps each distinct training row once, with the number of times it occurs.
+
+    The phishing features are ternary, so the training matrix repeats most of its rows.
+    Neighbours are taken with their multiplicity: a row seen three times fills three of
+    the n_neighbors slots, exactly as its three copies would in KNNImputer. The imputed
+    values are those of KNNImputer fitted on the full matrix, apart from the order in
+    which neighbours at the same distance are picked.
+    """
+    def __init__(self, missing_values=np.nan, n_neighbors: int = 5, weights: str = "uniform"):
+        self.missing_values = missing_values
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+
+    def fit(self, X, y=None):
+        try:
+            if not (isinstance(self.missing_values, float) and np.isnan(self.missing_values)):
+                raise ValueError("CompactKNNImputer only imputes NaN")
+            if self.weights not in ("uniform", "distance"):
+                raise ValueError(f"weights must be 'uniform' or 'distance', got {self.weights}")
+            X = self._validate_data(X, dtype=FLOAT_DTYPES, force_all_finite="allow-nan", copy=True)
+            mask = np.isnan(X)
+            ## one NaN bit pattern, so rows compare equal byte for byte
+            X[mask] = np.nan
+            rows = np.ascontiguousarray(X).view(np.dtype((np.void, X.dtype.itemsize * X.shape[1]))).ravel()
+            _, first_rows, counts = np.unique(rows, return_index=True, return_counts=True)
+            self.reference_ = X[first_rows]
+            self.counts_ = counts
+            self._valid_mask = ~mask.all(axis=0)
+
+            present = ~np.isnan(self.reference_)
+            weighted = np.where(present, self.reference_, 0.0) * counts[:, None]
+            with np.errstate(invalid="ignore"):
+                self.column_means_ = weighted.sum(axis=0) / (present * counts[:, None]).sum(axis=0)
+            return self
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _impute(self, distances: np.ndarray, values: np.ndarray, counts: np.ndarray, n_neighbors: int) -> np.ndarray:
+        ## every distinct row fills at least one slot, so the n_neighbors nearest hold all of them
+        n_candidates = min(n_neighbors, distances.shape[1])
+        candidates = np.argpartition(distances, n_candidates - 1, axis=1)[:, :n_candidates]
+        candidate_distances = np.take_along_axis(distances, candidates, axis=1)
+        order = np.argsort(candidate_distances, axis=1, kind="stable")
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        candidate_distances = np.take_along_axis(candidate_distances, order, axis=1)
+
+        candidate_counts = counts[candidates]
+        filled_before = np.cumsum(candidate_counts, axis=1) - candidate_counts
+        slots = np.clip(n_neighbors - filled_before, 0, candidate_counts)
+        if self.weights == "uniform":
+            weights = slots.astype(float)
+        else:
+            ## KNNImputer's distance weights, a neighbour at distance 0 takes all the weight
+            with np.errstate(divide="ignore"):
+                inverse = 1.0 / candidate_distances
+            exact = np.isinf(inverse)
+            exact_rows = exact.any(axis=1)
+            inverse[exact_rows] = exact[exact_rows]
+            inverse[np.isnan(inverse)] = 0.0
+            weights = slots * inverse
+        return (weights * values[candidates]).sum(axis=1) / weights.sum(axis=1)
+
+    def transform(self, X):
+        try:
+            check_is_fitted(self, "reference_")
+            X = self._validate_data(X, dtype=FLOAT_DTYPES, force_all_finite="allow-nan", copy=True, reset=False)
+            mask = np.isnan(X)
+            valid_columns = np.flatnonzero(self._valid_mask)
+            missing_rows = np.flatnonzero(mask[:, valid_columns].any(axis=1))
+            reference_present = ~np.isnan(self.reference_)
+
+            for start in range(0, missing_rows.shape[0], IMPUTATION_CHUNK_SIZE):
+                rows = missing_rows[start:start + IMPUTATION_CHUNK_SIZE]
+                distances = nan_euclidean_distances(X[rows], self.reference_)
+                for column in valid_columns:
+                    receivers = np.flatnonzero(mask[rows, column])
+                    if not receivers.size:
+                        continue
+                    donors = np.flatnonzero(reference_present[:, column])
+                    donor_distances = distances[np.ix_(receivers, donors)]
+                    ## rows sharing no observed column with any donor get the column mean
+                    no_distance = np.isnan(donor_distances).all(axis=1)
+                    X[rows[receivers[no_distance]], column] = self.column_means_[column]
+                    if no_distance.all():
+                        continue
+                    n_neighbors = min(self.n_neighbors, int(self.counts_[donors].sum()))
+                    X[rows[receivers[~no_distance]], column] = self._impute(
+                        donor_distances[~no_distance], self.reference_[donors, column],
+                        self.counts_[donors], n_neighbors)
+            return X[:, self._valid_mask]
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+
+def benchmark_compact_imputer(full_imputer, compact_imputer: CompactKNNImputer, x: np.ndarray,
+                              batch_sizes: Sequence[int] = (1, 100, 1000), repeats: int = 3) -> dict:
+    """
+    Reference matrix size in bytes and best-of-repeats latency in milliseconds of a
+    KNNImputer fitted on the full training matrix and of the compact one per batch size.
+    Rows of x are tiled when a batch is larger than x, pass rows that hold NaN. Both
+    imputers are fitted the same way, on named columns or on a plain array.
+    """
+    try:
+        report = {
+            "full_reference_bytes": full_imputer._fit_X.nbytes + full_imputer._mask_fit_X.nbytes,
+            "compact_reference_bytes": compact_imputer.reference_.nbytes + compact_imputer.counts_.nbytes,
+        }
+        for batch_size in batch_sizes:
+            batch = np.resize(x, (batch_size, x.shape[1]))
+            feature_names = getattr(compact_imputer, "feature_names_in_", None)
+            if feature_names is not None:
+                batch = pd.DataFrame(batch, columns=feature_names)
+            timings = {}
+            for name, imputer in (("full_ms", full_imputer), ("compact_ms", compact_imputer)):
+                best = float("inf")
+                for _ in range(repeats):
+                    start_time = time.perf_counter()
+                    imputer.transform(batch)
+                    best = min(best, time.perf_counter() - start_time)
+                timings[name] = best * 1000
+            timings["speedup"] = timings["full_ms"] / timings["compact_ms"]
+            report[batch_size] = timings
+        return report
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
@@ -2,6 +2,8 @@ from networksecurity.constant.training_pipeline import SAVED_MODEL_DIR,MODEL_FIL
 
 import os
 import sys
+import numpy as np
+import pandas as pd
 
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
@@ -14,10 +16,34 @@ class NetworkModel:
         except Exception as e:
             raise NetworkSecurityException(e,sys)
     
+    def align_columns(self,x):
+        """
+        Reorder a DataFrame into the column order the preprocessor was fitted on, the model
+        only sees positions once the values become an array
+        """
+        feature_names = getattr(self.preprocessor, "feature_names_in_", None)
+        if not isinstance(x, pd.DataFrame) or feature_names is None:
+            return x
+        missing_columns = [column for column in feature_names if column not in x.columns]
+        if missing_columns:
+            raise ValueError(f"Input is missing feature columns: {missing_columns}")
+        return x[list(feature_names)]
+
     def predict(self,x):
+        """
+        The preprocessor only imputes missing values, so complete rows go straight to the
+        model and only rows containing NaN are pushed through preprocessor.transform.
+        """
         try:
-            x_transform = self.preprocessor.transform(x)
-            y_hat = self.model.predict(x_transform)
+            x = self.align_columns(x)
+            x_values = np.asarray(x, dtype=float)
+            incomplete_rows = np.isnan(x_values).any(axis=1)
+            if incomplete_rows.any():
+                x_incomplete = x.iloc[incomplete_rows] if isinstance(x, pd.DataFrame) else x_values[incomplete_rows]
+                ## copy first, x_values may share memory with the caller's array
+                x_values = x_values.copy()
+                x_values[incomplete_rows] = self.preprocessor.transform(x_incomplete)
+            y_hat = self.model.predict(x_values)
             return y_hat
         except Exception as e:
             raise NetworkSecurityException(e,sys)
\ No newline at end of file
@@ -0,0 +1,138 @@
+import os
+import sys
+import threading
+
+from networksecurity.constant.training_pipeline import (
+    FINAL_MODEL_FILE_PATH,
+    FINAL_MODEL_MANIFEST_FILE_PATH,
+    FINAL_PREPROCESSOR_FILE_PATH,
+    MODEL_SERVING_RELOAD_INTERVAL_SECONDS,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.utils import load_object
+from networksecurity.utils.ml_utils.model.estimator import NetworkModel
+from networksecurity.utils.ml_utils.model.model_manifest import read_model_manifest
+from networksecurity.utils.ml_utils.model.prediction_cache import PredictionCache
+
+
+class NetworkModelCache:
+    """
+    Keeps one NetworkModel per process so requests never unpickle the preprocessor and model.
+
+    A watcher thread polls the final_model manifest and, when a retrain publishes a new
+    pair, loads it off the request path and swaps the reference in one assignment. The
+    manifest names both files of one version, so a preprocessor is never paired with
+    another version's model. Without a manifest the two files are watched directly (mtime
+    and size). predict() also goes through a PredictionCache that is cleared whenever the
+    pair is swapped.
+    """
+    def __init__(self,
+                 preprocessor_file_path: str = FINAL_PREPROCESSOR_FILE_PATH,
+                 model_file_path: str = FINAL_MODEL_FILE_PATH,
+                 reload_interval: float = MODEL_SERVING_RELOAD_INTERVAL_SECONDS,
+                 manifest_file_path: str = FINAL_MODEL_MANIFEST_FILE_PATH):
+        try:
+            self.preprocessor_file_path = preprocessor_file_path
+            self.model_file_path = model_file_path
+            self.manifest_file_path = manifest_file_path
+            self.reload_interval = reload_interval
+            self.version: int = 0
+            self.prediction_cache = PredictionCache()
+            self._network_model = None
+            self._signature = None
+            self._lock = threading.Lock()
+            self._stop_event = threading.Event()
+            self._watcher = None
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _file_signature(self) -> tuple:
+        signature = []
+        for file_path in (self.preprocessor_file_path, self.model_file_path):
+            stat = os.stat(file_path)
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _current_pair(self) -> tuple:
+        """
+        (preprocessor path, model path, signature) of the pair that should be serving
+        """
+        if self.manifest_file_path and os.path.exists(self.manifest_file_path):
+            manifest = read_model_manifest(self.manifest_file_path)
+            return manifest["preprocessor_file_path"], manifest["model_file_path"], ("manifest", manifest["version"])
+        return self.preprocessor_file_path, self.model_file_path, self._file_signature()
+
+    def refresh(self) -> bool:
+        """
+        Reload the pair if the files changed since the last load.
+        Returns True when a new model was swapped in.
+        """
+        try:
+            with self._lock:
+                preprocessor_file_path, model_file_path, signature = self._current_pair()
+                if signature == self._signature and self._network_model is not None:
+                    return False
+
+                logging.info(f"Loading model pair from {preprocessor_file_path} and {model_file_path}")
+                preprocessor = load_object(preprocessor_file_path)
+                model = load_object(model_file_path)
+
+                ## versioned files never change, but without a manifest a publish that landed
+                ## while we were unpickling may have given us a mixed pair
+                if signature[0] != "manifest" and self._file_signature() != signature:
+                    logging.info("Model files changed during reload, will retry on the next check")
+                    if self._network_model is not None:
+                        return False
+                    signature = None
+
+                self._network_model = NetworkModel(preprocessor=preprocessor, model=model)
+                ## swap first, then invalidate, so nothing predicted by the old pair survives
+                self.prediction_cache.clear()
+                self._signature = signature
+                self.version += 1
+                logging.info(f"Model version {self.version} is now serving")
+                return True
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def get_model(self) -> NetworkModel:
+        try:
+            network_model = self._network_model
+            if network_model is None:
+                self.refresh()
+                network_model = self._network_model
+            return network_model
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def predict(self, x):
+        try:
+            generation = self.prediction_cache.generation
+            network_model = self.get_model()
+            ## cache keys are positional, so order the columns before packing them
+            x = network_model.align_columns(x)
+            return self.prediction_cache.predict(network_model, x, generation=generation)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _watch(self):
+        while not self._stop_event.wait(self.reload_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                ## keep serving the current pair, a retrain may still be publishing
+                logging.warning(f"Model reload failed: {str(e)}")
+
+    def start_watcher(self):
+        try:
+            if self._watcher is not None and self._watcher.is_alive():
+                return
+            self._stop_event.clear()
+            self._watcher = threading.Thread(target=self._watch, name="model-cache-watcher", daemon=True)
+            self._watcher.start()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def stop_watcher(self):
+        self._stop_event.set()
@@ -0,0 +1,75 @@
+import os
+import shutil
+import sys
+from datetime import datetime
+from typing import Optional
+
+import yaml
+
+from networksecurity.constant.training_pipeline import (
+    FINAL_MODEL_KEEP_VERSIONS,
+    FINAL_MODEL_MANIFEST_FILE_PATH,
+    FINAL_MODEL_VERSIONS_DIR_NAME,
+    MODEL_FILE_NAME,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.utils import read_yaml_file, save_object
+
+PREPROCESSOR_FILE_NAME = "preprocessor.pkl"
+
+
+def publish_model_pair(preprocessor, model, manifest_file_path: str = FINAL_MODEL_MANIFEST_FILE_PATH,
+                       metadata: Optional[dict] = None, keep_versions: int = FINAL_MODEL_KEEP_VERSIONS) -> str:
+    """
+    Publish a preprocessor and model that must be served together.
+
+    Both are written into a new version directory that nothing reads yet, then the manifest
+    naming them is replaced in one rename. A reader of the manifest always gets a matching
+    pair. The newest keep_versions directories are kept for processes still loading them.
+
+    metadata: extra entries stored in the manifest, e.g. the features the model expects
+    return: the published version
+    """
+    try:
+        model_dir = os.path.dirname(manifest_file_path)
+        manifest_name = os.path.splitext(os.path.basename(manifest_file_path))[0]
+        versions_dir = os.path.join(model_dir, FINAL_MODEL_VERSIONS_DIR_NAME, manifest_name)
+        version = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        version_dir = os.path.join(versions_dir, version)
+
+        save_object(os.path.join(version_dir, PREPROCESSOR_FILE_NAME), preprocessor)
+        save_object(os.path.join(version_dir, MODEL_FILE_NAME), model)
+
+        manifest = dict(metadata or {})
+        manifest.update({
+            "version": version,
+            ## relative to the manifest, so the model directory can be synced and moved as a whole
+            "preprocessor_file_path": os.path.relpath(os.path.join(version_dir, PREPROCESSOR_FILE_NAME), model_dir),
+            "model_file_path": os.path.relpath(os.path.join(version_dir, MODEL_FILE_NAME), model_dir),
+        })
+        temp_file_path = f"{manifest_file_path}.tmp"
+        with open(temp_file_path, "w") as file_obj:
+            yaml.safe_dump(manifest, file_obj)
+        os.replace(temp_file_path, manifest_file_path)
+        logging.info(f"Published model version {version} to {manifest_file_path}")
+
+        for old_version in sorted(os.listdir(versions_dir))[:-keep_versions]:
+            shutil.rmtree(os.path.join(versions_dir, old_version), ignore_errors=True)
+        return version
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
+
+
+def read_model_manifest(manifest_file_path: str = FINAL_MODEL_MANIFEST_FILE_PATH) -> dict:
+    """
+    The manifest with its file paths resolved against the manifest's directory
+    """
+    try:
+        manifest = read_yaml_file(manifest_file_path)
+        model_dir = os.path.dirname(manifest_file_path)
+        for key in ("preprocessor_file_path", "model_file_path"):
+            manifest[key] = os.path.join(model_dir, manifest[key])
+        return manifest
+    except Exception as e:
+        raise NetworkSecurityException(e, sys) from e
@@ -0,0 +1,94 @@
+import asyncio
+import sys
+from typing import Any, Callable, Sequence
+
+import numpy as np
+
+from networksecurity.constant.training_pipeline import (
+    PREDICTION_BATCH_MAX_SIZE,
+    PREDICTION_BATCH_MAX_WAIT_MS,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+
+class PredictionBatcher:
+    """
+    Coalesces concurrent single-record predictions into one model call.
+
+    The first queued record opens a batch, which is closed after max_wait_ms or once
+    max_batch_size records have arrived. The stacked rows are scored in one call to
+    predict_fn (a coroutine function, or a plain function run in the default executor)
+    and each caller gets its own prediction back.
+    Raising max_wait_ms trades p99 latency for throughput.
+    """
+    def __init__(self, predict_fn: Callable[[np.ndarray], Any],
+                 max_batch_size: int = PREDICTION_BATCH_MAX_SIZE,
+                 max_wait_ms: float = PREDICTION_BATCH_MAX_WAIT_MS):
+        try:
+            self.predict_fn = predict_fn
+            self.max_batch_size = max_batch_size
+            self.max_wait = max_wait_ms / 1000.0
+            self._queue = None
+            self._worker = None
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+        logging.info(f"Prediction batcher started with max_batch_size={self.max_batch_size} max_wait={self.max_wait}s")
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def predict(self, row: Sequence[float]):
+        """
+        Queue one feature vector and wait for its prediction
+        """
+        if self._worker is None:
+            raise RuntimeError("PredictionBatcher.start() has not been awaited")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((np.asarray(row, dtype=float), future))
+        return await future
+
+    async def _collect_batch(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch()
+            rows = np.vstack([row for row, _ in batch])
+            try:
+                if asyncio.iscoroutinefunction(self.predict_fn):
+                    y_pred = await self.predict_fn(rows)
+                else:
+                    y_pred = await loop.run_in_executor(None, self.predict_fn, rows)
+            except Exception as e:
+                logging.error(f"Batched prediction of {len(batch)} rows failed: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), y_hat in zip(batch, y_pred):
+                ## the caller may have gone away while the batch was being scored
+                if not future.done():
+                    future.set_result(y_hat)
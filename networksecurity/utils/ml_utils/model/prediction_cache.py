@@ -0,0 +1,87 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.constant.training_pipeline import PREDICTION_CACHE_MAX_SIZE
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils.main_utils.packing import pack_rows
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of predictions keyed by the row packed into one 64-bit integer.
+
+    Rows that cannot be packed (values outside {-1, 0, 1}) always go to the model.
+    clear() bumps the generation, and a predict() started under an older generation
+    does not store its results, so a model swap never leaves stale entries behind.
+    """
+    def __init__(self, max_size: int = PREDICTION_CACHE_MAX_SIZE):
+        try:
+            self.max_size = max_size
+            self.hits = 0
+            self.misses = 0
+            self.generation = 0
+            self._entries = OrderedDict()
+            self._lock = threading.Lock()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "max_size": self.max_size,
+                    "hits": self.hits, "misses": self.misses}
+
+    def predict(self, network_model, x, generation: int = None) -> np.ndarray:
+        """
+        Predict x, sending only the cache misses to network_model.predict
+        """
+        try:
+            if generation is None:
+                generation = self.generation
+            x_values = np.asarray(x, dtype=float)
+            keys, packable = pack_rows(x_values)
+            keys = keys.tolist()
+
+            hit_rows, hit_values = [], []
+            with self._lock:
+                for row in np.flatnonzero(packable):
+                    value = self._entries.get(keys[row])
+                    if value is not None:
+                        self._entries.move_to_end(keys[row])
+                        hit_rows.append(row)
+                        hit_values.append(value)
+                self.hits += len(hit_rows)
+                self.misses += len(keys) - len(hit_rows)
+
+            miss_mask = np.ones(len(keys), dtype=bool)
+            miss_mask[hit_rows] = False
+            miss_rows = np.flatnonzero(miss_mask)
+            if miss_rows.size == 0:
+                return np.asarray(hit_values)
+
+            x_miss = x.iloc[miss_rows] if isinstance(x, pd.DataFrame) else x_values[miss_rows]
+            y_miss = np.asarray(network_model.predict(x_miss))
+            y_hat = np.empty(len(keys), dtype=y_miss.dtype)
+            y_hat[miss_rows] = y_miss
+            if hit_rows:
+                y_hat[hit_rows] = hit_values
+
+            with self._lock:
+                if generation == self.generation:
+                    for row, value in zip(miss_rows, y_miss):
+                        if packable[row]:
+                            self._entries[keys[row]] = value
+                            self._entries.move_to_end(keys[row])
+                    while len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+            return y_hat
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
@@ -0,0 +1,263 @@
+import sys
+import time
+from typing import Optional, Sequence
+
+import numpy as np
+from sklearn.ensemble import ExtraTreesClassifier, GradientBoostingClassifier, RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.packing import MAX_PACKED_COLUMNS, pack_rows
+
+## rows scored per traversal block, bounds the (rows, trees) node index matrix
+EVALUATION_BLOCK_SIZE = 8192
+## smaller batches rarely repeat a row, serving already sends them through the prediction cache
+DISTINCT_ROWS_MIN_BATCH = 1024
+## batch sizes tried when looking for the size from which sklearn is faster
+CROSSOVER_BATCH_SIZES = (1, 4, 16, 64, 256, 1024, 4096, 16384)
+
+
+class CompiledTreeEnsemble:
+    """
+    A fitted tree ensemble flattened into contiguous node arrays.
+
+    All trees are walked at once: every (row, tree) pair holds a node index that is
+    advanced one level per step, and pairs that reached their leaf drop out of the walk.
+    Repeated rows of a batch are scored once. NumPy cannot match sklearn's compiled
+    traversal on large batches, so when sklearn_model is set, batches of at least
+    sklearn_min_rows distinct rows are handed to it; see calibrate_sklearn_crossover.
+    It exposes predict and can replace the sklearn model inside NetworkModel.
+    """
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth,
+                 classes, kind, init_score=0.0, learning_rate=1.0,
+                 sklearn_model=None, sklearn_min_rows=None):
+        ## node indices are pointer sized, numpy casts narrower index arrays on every gather
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.threshold = threshold
+        self.left = np.asarray(left, dtype=np.intp)
+        self.right = np.asarray(right, dtype=np.intp)
+        self.value = value
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.max_depth = max_depth
+        self.classes_ = classes
+        self.kind = kind
+        self.init_score = init_score
+        self.learning_rate = learning_rate
+        self.sklearn_model = sklearn_model
+        self.sklearn_min_rows = sklearn_min_rows
+        self.is_leaf = self.left == np.arange(self.left.shape[0])
+        ## children[2 * node + go_left] picks the next node in one gather, a leaf is stored
+        ## as ~leaf so the walk tells it apart by its sign
+        self.children = np.empty(2 * self.left.shape[0], dtype=np.intp)
+        self.children[0::2] = np.where(self.is_leaf[self.right], ~self.right, self.right)
+        self.children[1::2] = np.where(self.is_leaf[self.left], ~self.left, self.left)
+
+    @classmethod
+    def from_sklearn(cls, model) -> "CompiledTreeEnsemble":
+        try:
+            init_score, learning_rate = 0.0, 1.0
+            if isinstance(model, DecisionTreeClassifier):
+                trees, kind = [model.tree_], "proba"
+            elif isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)):
+                trees, kind = [estimator.tree_ for estimator in model.estimators_], "proba"
+            elif isinstance(model, GradientBoostingClassifier):
+                if model.estimators_.shape[1] != 1:
+                    raise ValueError("Only binary GradientBoostingClassifier can be compiled")
+                trees, kind = [estimator.tree_ for estimator in model.estimators_[:, 0]], "gradient_boosting"
+                init_score = float(model._raw_predict_init(np.zeros((1, model.n_features_in_)))[0, 0])
+                learning_rate = model.learning_rate
+            else:
+                raise ValueError(f"Cannot compile model of type {type(model).__name__}")
+
+            features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+            offset, max_depth = 0, 0
+            for tree in trees:
+                node_index = np.arange(tree.node_count) + offset
+                is_leaf = tree.children_left == -1
+                features.append(np.where(is_leaf, 0, tree.feature))
+                thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+                lefts.append(np.where(is_leaf, node_index, tree.children_left + offset))
+                rights.append(np.where(is_leaf, node_index, tree.children_right + offset))
+                if kind == "proba":
+                    node_value = tree.value[:, 0, :]
+                    normalizer = node_value.sum(axis=1, keepdims=True)
+                    normalizer[normalizer == 0.0] = 1.0
+                    values.append(node_value / normalizer)
+                else:
+                    ## the same learning_rate * value product sklearn adds per stage
+                    values.append(learning_rate * tree.value[:, 0, :1])
+                roots.append(offset)
+                offset += tree.node_count
+                max_depth = max(max_depth, tree.max_depth)
+
+            return cls(
+                feature=np.concatenate(features),
+                threshold=np.concatenate(thresholds).astype(np.float64),
+                left=np.concatenate(lefts),
+                right=np.concatenate(rights),
+                value=np.ascontiguousarray(np.concatenate(values)),
+                roots=roots,
+                max_depth=max_depth,
+                classes=model.classes_,
+                kind=kind,
+                init_score=init_score,
+                learning_rate=learning_rate,
+            )
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def _leaf_values(self, x: np.ndarray) -> np.ndarray:
+        n_rows, n_trees = x.shape[0], self.roots.shape[0]
+        nodes = np.tile(self.roots, n_rows)
+        ## float32 widens exactly, so comparing in float64 matches sklearn's comparisons
+        x_flat = x.astype(np.float64).ravel()
+        row_offsets = np.repeat(np.arange(n_rows) * x.shape[1], n_trees)
+        ## the walk only carries pairs still above their leaf, so a block costs the sum of
+        ## its path lengths rather than rows * trees * max_depth
+        if self.is_leaf[self.roots].any():
+            pairs = np.flatnonzero(~self.is_leaf[nodes])
+            current, row_offsets = nodes[pairs], row_offsets[pairs]
+        else:
+            pairs, current = np.arange(nodes.shape[0]), nodes.copy()
+        while pairs.size:
+            go_left = x_flat[row_offsets + self.feature[current]] <= self.threshold[current]
+            current = self.children[2 * current + go_left]
+            at_leaf = current < 0
+            if at_leaf.all():
+                nodes[pairs] = ~current
+                break
+            if at_leaf.any():
+                nodes[pairs[at_leaf]] = ~current[at_leaf]
+                walking = ~at_leaf
+                pairs, current, row_offsets = pairs[walking], current[walking], row_offsets[walking]
+        return self.value[nodes.reshape(n_rows, n_trees)]
+
+    def _predict_block(self, x: np.ndarray) -> np.ndarray:
+        leaf_values = self._leaf_values(x)
+        ## accumulate tree by tree in sklearn's order so ties break the same way, cumsum adds
+        ## sequentially where sum would add pairwise
+        if self.kind == "proba":
+            proba = np.cumsum(leaf_values, axis=1)[:, -1] / leaf_values.shape[1]
+            return self.classes_.take(np.argmax(proba, axis=1), axis=0)
+        terms = np.empty((x.shape[0], leaf_values.shape[1] + 1))
+        terms[:, 0] = self.init_score
+        terms[:, 1:] = leaf_values[:, :, 0]
+        raw = np.cumsum(terms, axis=1)[:, -1]
+        ## sklearn 1.3 takes the argmax of [1 - p, p], so a tie goes to the first class
+        return self.classes_[(raw > 0).astype(int)]
+
+    @staticmethod
+    def _distinct_rows(x: np.ndarray):
+        """
+        Rows of x to score and, for every row, the position of its prediction among them.
+        Rows that do not pack into 64 bits are scored as they are.
+        """
+        if x.shape[0] < DISTINCT_ROWS_MIN_BATCH or x.shape[1] > MAX_PACKED_COLUMNS:
+            return None, None
+        keys, packable = pack_rows(x)
+        packed_rows = np.flatnonzero(packable)
+        other_rows = np.flatnonzero(~packable)
+        _, first_rows, inverse = np.unique(keys[packed_rows], return_index=True, return_inverse=True)
+        positions = np.empty(x.shape[0], dtype=np.intp)
+        positions[packed_rows] = inverse
+        positions[other_rows] = first_rows.shape[0] + np.arange(other_rows.shape[0])
+        return np.concatenate([packed_rows[first_rows], other_rows]), positions
+
+    def _predict_distinct(self, x: np.ndarray) -> np.ndarray:
+        if self.sklearn_model is not None and x.shape[0] >= self.sklearn_min_rows:
+            return self.sklearn_model.predict(x)
+        blocks = [self._predict_block(x[start:start + EVALUATION_BLOCK_SIZE])
+                  for start in range(0, x.shape[0], EVALUATION_BLOCK_SIZE)]
+        if not blocks:
+            return np.empty(0, dtype=self.classes_.dtype)
+        return np.concatenate(blocks)
+
+    def predict(self, x) -> np.ndarray:
+        try:
+            ## sklearn trees compare float32 inputs against their thresholds
+            x = np.asarray(x, dtype=np.float32)
+            if x.ndim == 1:
+                x = x.reshape(1, -1)
+            rows, positions = self._distinct_rows(x)
+            if rows is None:
+                return self._predict_distinct(x)
+            return self._predict_distinct(x[rows])[positions]
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+
+def compile_tree_ensemble(model, x_check: np.ndarray) -> Optional[CompiledTreeEnsemble]:
+    """
+    Compile model and check it predicts exactly like sklearn on x_check.
+    Returns None when the model type is not supported or predictions differ.
+    """
+    try:
+        compiled = CompiledTreeEnsemble.from_sklearn(model)
+    except Exception as e:
+        logging.info(f"Model is not compiled: {str(e)}")
+        return None
+    mismatches = int(np.sum(compiled.predict(x_check) != model.predict(x_check)))
+    if mismatches:
+        logging.warning(f"Compiled model disagrees with sklearn on {mismatches} of {len(x_check)} rows, not using it")
+        return None
+    logging.info(f"Compiled {type(model).__name__} matches sklearn on {len(x_check)} rows")
+    return compiled
+
+
+def calibrate_sklearn_crossover(model, compiled: CompiledTreeEnsemble, x: np.ndarray,
+                                batch_sizes: Sequence[int] = CROSSOVER_BATCH_SIZES, repeats: int = 3) -> CompiledTreeEnsemble:
+    """
+    Hand batches to model from the first size at which it beats the compiled walk.
+    Timed on distinct rows of x, since repeated rows are only scored once anyway.
+    """
+    try:
+        distinct_x = np.unique(np.asarray(x, dtype=np.float32), axis=0)
+        compiled.sklearn_model, compiled.sklearn_min_rows = None, None
+        crossover = None
+        for batch_size in batch_sizes:
+            batch = np.resize(distinct_x, (batch_size, distinct_x.shape[1]))
+            timings = {}
+            for name, predict_fn in (("sklearn", model.predict), ("compiled", compiled._predict_distinct)):
+                best = float("inf")
+                for _ in range(repeats):
+                    start_time = time.perf_counter()
+                    predict_fn(batch)
+                    best = min(best, time.perf_counter() - start_time)
+                timings[name] = best
+            if timings["sklearn"] < timings["compiled"]:
+                crossover = batch_size
+                break
+        compiled.sklearn_model, compiled.sklearn_min_rows = model, crossover
+        if crossover is None:
+            compiled.sklearn_model = None
+        logging.info(f"Compiled model hands batches of {crossover} distinct rows and more to sklearn"
+                     if crossover is not None else "Compiled model is faster at every calibrated batch size")
+        return compiled
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+
+def benchmark_compiled_model(model, compiled: CompiledTreeEnsemble, x: np.ndarray,
+                             batch_sizes: Sequence[int] = (1, 100, 100_000), repeats: int = 3) -> dict:
+    """
+    Best-of-repeats latency in milliseconds of sklearn and the compiled model per batch size.
+    Rows of x are tiled when a batch is larger than x.
+    """
+    try:
+        report = {}
+        for batch_size in batch_sizes:
+            batch = np.resize(x, (batch_size, x.shape[1]))
+            timings = {}
+            for name, predictor in (("sklearn_ms", model), ("compiled_ms", compiled)):
+                best = float("inf")
+                for _ in range(repeats):
+                    start_time = time.perf_counter()
+                    predictor.predict(batch)
+                    best = min(best, time.perf_counter() - start_time)
+                timings[name] = best * 1000
+            timings["speedup"] = timings["sklearn_ms"] / timings["compiled_ms"]
+            report[batch_size] = timings
+        return report
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
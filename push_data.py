@@ -1,61 +1,131 @@
 import os
 import sys
-import json
-
-from dotenv import load_dotenv
-load_dotenv()
-
-MONGO_DB_URL=os.getenv("MONGO_URL_KEY")
-print(MONGO_DB_URL)
-
-import certifi
-ca=certifi.where()
+import time
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 import pandas as pd
 import numpy as np
-import pymongo
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.mongo_client import get_mongo_client
+
+ROW_HASH_FIELD="row_hash"
+DUPLICATE_KEY_ERROR=11000
 
 class NetworkDataExtract():
-    def __init__(self):
+    """
+    Bulk loads CSV exports into mongodb.
+
+    The CSV is read in chunks and each chunk becomes documents straight from its numeric
+    array. Batches are written with parallel unordered bulk upserts over one pooled client.
+    Every document carries a row_hash of its values and of how many identical rows came
+    before it in the file, under a unique index. Loading the same data again, under any
+    file name, only inserts rows that are not stored yet; repeated samples stay separate.
+    """
+    def __init__(self,mongo_client=None,max_workers: int=8):
         try:
-            pass
+            if mongo_client is None:
+                mongo_client=get_mongo_client(max_pool_size=max_workers)
+            self.mongo_client=mongo_client
+            self.max_workers=max_workers
         except Exception as e:
             raise NetworkSecurityException(e,sys)
-        
-    def csv_to_json_convertor(self,file_path):
+
+    @staticmethod
+    def chunk_to_documents(chunk: pd.DataFrame,occurrences: dict):
+        """
+        Documents of one CSV chunk, missing values become None.
+        occurrences counts the rows seen so far by their values and is updated in place.
+        """
+        columns=list(chunk.columns)
+        values=chunk.to_numpy(dtype=np.float32)
+        missing=np.isnan(values)
+        ## the hash covers a fixed-width encoding of the row, missing values included
+        row_bytes=np.where(missing,np.iinfo(np.int8).min,values).astype(np.int8)
+        rows=np.where(missing,None,np.where(missing,0,values).astype(np.int64)).tolist()
+        documents=[]
+        for offset,row in enumerate(rows):
+            document=dict(zip(columns,row))
+            key=row_bytes[offset].tobytes()
+            occurrence=occurrences.get(key,0)
+            occurrences[key]=occurrence+1
+            row_hash=hashlib.blake2b(key,digest_size=16)
+            row_hash.update(f":{occurrence}".encode())
+            document[ROW_HASH_FIELD]=row_hash.hexdigest()
+            documents.append(document)
+        return documents
+
+    @staticmethod
+    def upsert_batch(collection,documents) -> int:
+        """
+        Insert the documents whose row_hash is not stored yet, return how many are new
+        """
+        requests=[UpdateOne({ROW_HASH_FIELD:document[ROW_HASH_FIELD]},{"$setOnInsert":document},upsert=True)
+                  for document in documents]
         try:
-            data=pd.read_csv(file_path)
-            data.reset_index(drop=True,inplace=True)
-            records=list(json.loads(data.T.to_json()).values()) #dataTranspose to json then convert into value
-            return records
-        except Exception as e:
-            raise NetworkSecurityException(e,sys)
-        
-    def insert_data_mongodb(self,records,database,collection):
+            return collection.bulk_write(requests,ordered=False).upserted_count
+        except BulkWriteError as e:
+            ## two loaders upserting the same new row race on the unique index, one of them wins
+            other_errors=[error for error in e.details.get("writeErrors",[]) if error.get("code")!=DUPLICATE_KEY_ERROR]
+            if other_errors or e.details.get("writeConcernErrors"):
+                raise
+            return e.details.get("nUpserted",0)
+
+    def load_csv(self,file_path: str,database: str,collection: str,
+                 chunk_size: int=100000,batch_size: int=5000) -> dict:
+        """
+        Stream file_path into database.collection
+        return: rows read, rows inserted, seconds and rows per second
+        """
         try:
-            self.database=database
-            self.collection=collection
-            self.records=records
-
-            self.mongo_client=pymongo.MongoClient(MONGO_DB_URL)
-            self.database = self.mongo_client[self.database]
-            
-            self.collection=self.database[self.collection]
-            self.collection.insert_many(self.records)
-            return(len(self.records))
+            start=time.perf_counter()
+            target=self.mongo_client[database][collection]
+            target.create_index(ROW_HASH_FIELD,unique=True)
+
+            rows_read=0
+            rows_inserted=0
+            pending=set()
+            occurrences={}
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for chunk in pd.read_csv(file_path,chunksize=chunk_size,na_values=["na"]):
+                    documents=self.chunk_to_documents(chunk,occurrences)
+                    rows_read+=len(documents)
+                    for batch_start in range(0,len(documents),batch_size):
+                        ## bound the batches in flight so memory stays flat on large files
+                        if len(pending)>=2*self.max_workers:
+                            done,pending=wait(pending,return_when=FIRST_COMPLETED)
+                            rows_inserted+=sum(future.result() for future in done)
+                        pending.add(executor.submit(self.upsert_batch,target,documents[batch_start:batch_start+batch_size]))
+                rows_inserted+=sum(future.result() for future in pending)
+
+            seconds=time.perf_counter()-start
+            report={
+                "rows_read":rows_read,
+                "rows_inserted":rows_inserted,
+                "seconds":seconds,
+                "rows_per_second":rows_read/seconds if seconds else float("inf"),
+            }
+            logging.info(f"Loaded {file_path} into {database}.{collection}: {report}")
+            return report
         except Exception as e:
             raise NetworkSecurityException(e,sys)
-        
-if __name__=='__main__':
-    FILE_PATH="Network_Data\phisingData.csv"
-    DATABASE="SHIVAM"
-    Collection="NetworkData"
-    networkobj=NetworkDataExtract()
-    records=networkobj.csv_to_json_convertor(file_path=FILE_PATH)
-    print(records)
-    no_of_records=networkobj.insert_data_mongodb(records,DATABASE,Collection)
-    print(no_of_records)
 
+if __name__=='__main__':
+    parser=argparse.ArgumentParser(description="Bulk load a CSV export into mongodb")
+    parser.add_argument("file_path",nargs="?",default=os.path.join("Network_Data","phisingData.csv"))
+    parser.add_argument("--database",default="SHIVAM")
+    parser.add_argument("--collection",default="NetworkData")
+    parser.add_argument("--chunk-size",type=int,default=100000)
+    parser.add_argument("--batch-size",type=int,default=5000)
+    parser.add_argument("--workers",type=int,default=8)
+    args=parser.parse_args()
 
+    networkobj=NetworkDataExtract(max_workers=args.workers)
+    report=networkobj.load_csv(args.file_path,args.database,args.collection,
+                               chunk_size=args.chunk_size,batch_size=args.batch_size)
+    print(f"{report['rows_read']} rows read, {report['rows_inserted']} inserted "
+          f"in {report['seconds']:.2f}s ({report['rows_per_second']:.0f} rows/s)")
@@ -0,0 +1,73 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import dns.resolver
+
+from networksecurity.utils.main_utils.feature_extraction import CachingResolver
+
+
+class Answer:
+    def __init__(self, ttl, addresses):
+        self.rrset = SimpleNamespace(ttl=ttl)
+        self._records = [SimpleNamespace(address=address) for address in addresses]
+
+    def __iter__(self):
+        return iter(self._records)
+
+
+class FakeDnsResolver:
+    """
+    Stands in for dns.resolver.Resolver, counting queries per host
+    """
+    def __init__(self, ttl=60, delay=0.0):
+        self.ttl = ttl
+        self.delay = delay
+        self.queries = []
+        self._lock = threading.Lock()
+
+    def resolve(self, host, record_type):
+        with self._lock:
+            self.queries.append(host)
+        time.sleep(self.delay)
+        if host.startswith("missing"):
+            raise dns.resolver.NXDOMAIN()
+        return Answer(self.ttl, ["192.0.2.1"])
+
+
+def make_resolver(**kwargs):
+    resolver = CachingResolver(min_ttl=1, max_ttl=3600, negative_ttl=30)
+    resolver._resolver = FakeDnsResolver(**kwargs)
+    return resolver, resolver._resolver
+
+
+def test_bulk_resolution_queries_each_host_once():
+    resolver, fake = make_resolver(delay=0.01)
+    hosts = ["example.com", "missing.test", "", None] + ["example.org"] * 5 + ["example.com"] * 5
+
+    answers = resolver.resolve_many(hosts)
+
+    assert answers == {"example.com": ["192.0.2.1"], "missing.test": None, "example.org": ["192.0.2.1"]}
+    assert sorted(fake.queries) == ["example.com", "example.org", "missing.test"]
+
+
+def test_repeated_and_failed_hosts_cost_no_further_queries():
+    resolver, fake = make_resolver()
+    resolver.resolve_many(["example.com", "missing.test"])
+
+    assert resolver.resolve("example.com") == ["192.0.2.1"]
+    assert resolver.resolve("missing.test") is None
+    assert resolver.resolve_many(["example.com", "missing.test"]) == {"example.com": ["192.0.2.1"],
+                                                                      "missing.test": None}
+    assert len(fake.queries) == 2
+
+
+def test_probe_waits_for_a_host_the_bulk_lookup_is_resolving():
+    resolver, fake = make_resolver(delay=0.2)
+    bulk = threading.Thread(target=resolver.resolve_many, args=(["example.com"],))
+    bulk.start()
+    time.sleep(0.05)
+
+    assert resolver.resolve("example.com") == ["192.0.2.1"]
+    bulk.join()
+    assert fake.queries == ["example.com"]
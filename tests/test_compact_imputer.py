@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.impute import KNNImputer
+from sklearn.pipeline import Pipeline
+
+from networksecurity.utils.ml_utils.model.compact_imputer import CompactKNNImputer, benchmark_compact_imputer
+from networksecurity.utils.ml_utils.model.estimator import NetworkModel
+
+
+def make_training_set(seed=0):
+    ## continuous values so no two neighbours tie, every distinct row repeated several times
+    rng = np.random.default_rng(seed)
+    distinct = rng.normal(size=(300, 6))
+    distinct[rng.random(distinct.shape) < 0.1] = np.nan
+    rows = rng.integers(0, 300, 2000)
+    return distinct[rows], (np.nan_to_num(distinct[rows, 0]) > 0).astype(int)
+
+
+def make_incomplete_rows(rows, seed=1):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=(rows, 6))
+    x[rng.random(x.shape) < 0.3] = np.nan
+    x[0] = np.nan
+    ## shares no observed column with the training rows missing column 0
+    x[1] = [1.0] + [np.nan] * 5
+    return x
+
+
+@pytest.mark.parametrize("weights", ["uniform", "distance"])
+@pytest.mark.parametrize("n_neighbors", [1, 3, 5])
+def test_imputes_like_knn_imputer_on_the_full_matrix(weights, n_neighbors):
+    x_train, _ = make_training_set()
+    x_test = make_incomplete_rows(500)
+
+    full = KNNImputer(n_neighbors=n_neighbors, weights=weights).fit(x_train)
+    compact = CompactKNNImputer(n_neighbors=n_neighbors, weights=weights).fit(x_train)
+
+    assert compact.reference_.shape[0] < x_train.shape[0]
+    np.testing.assert_allclose(compact.transform(x_test), full.transform(x_test), rtol=0, atol=1e-12)
+
+
+def test_predictions_match_the_full_reference_imputer():
+    x_train, y_train = make_training_set()
+    columns = [f"feature_{index}" for index in range(6)]
+    model = RandomForestClassifier(n_estimators=16, random_state=0).fit(np.nan_to_num(x_train), y_train)
+    full = NetworkModel(preprocessor=Pipeline([("imputer", KNNImputer(n_neighbors=3))]).fit(
+        pd.DataFrame(x_train, columns=columns)), model=model)
+    compact = NetworkModel(preprocessor=Pipeline([("imputer", CompactKNNImputer(n_neighbors=3))]).fit(
+        pd.DataFrame(x_train, columns=columns)), model=model)
+    ## NetworkModel reorders columns by the names the imputer was fitted on
+    x_test = pd.DataFrame(make_incomplete_rows(500), columns=columns)[columns[::-1]]
+
+    np.testing.assert_array_equal(compact.predict(x_test), full.predict(x_test))
+
+
+def test_benchmark_reports_a_smaller_reference():
+    x_train, _ = make_training_set()
+    full = KNNImputer(n_neighbors=3).fit(x_train)
+    compact = CompactKNNImputer(n_neighbors=3).fit(x_train)
+
+    report = benchmark_compact_imputer(full, compact, make_incomplete_rows(50), batch_sizes=(1, 100), repeats=1)
+
+    assert report["compact_reference_bytes"] < report["full_reference_bytes"]
+    assert set(report[100]) == {"full_ms", "compact_ms", "speedup"}
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta, timezone
+
+import mongomock
+import numpy as np
+import pytest
+from bson import ObjectId
+
+from networksecurity.components.data_ingestion import DataIngestion
+from networksecurity.entity.config_entity import DataIngestionConfig, TrainingPipelineConfig
+from networksecurity.utils.main_utils.utils import get_schema_columns
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def object_id_at(seconds, counter):
+    ## ObjectIds minted by a client at START + seconds, ordered by counter within a second
+    return ObjectId(ObjectId.from_datetime(START + timedelta(seconds=seconds)).binary[:4] + counter.to_bytes(8, "big"))
+
+
+def document(object_id, value):
+    return {"_id": object_id, **{column: value for column in get_schema_columns()}}
+
+
+@pytest.fixture
+def ingestion(tmp_path):
+    config = DataIngestionConfig(TrainingPipelineConfig())
+    config.feature_store_file_path = str(tmp_path / "run" / "feature_store.npy")
+    config.persistent_feature_store_file_path = str(tmp_path / "store" / "feature_store.npy")
+    config.watermark_file_path = str(tmp_path / "store" / "watermark.yaml")
+    config.export_batch_size = 2
+    config.watermark_safety_window_seconds = 60
+    return DataIngestion(config, mongo_client=mongomock.MongoClient())
+
+
+def test_incremental_runs_only_append_the_delta(ingestion):
+    collection = ingestion.mongo_client[ingestion.data_ingestion_config.database_name][
+        ingestion.data_ingestion_config.collection_name]
+    collection.insert_many([document(object_id_at(0, counter), 1) for counter in range(3)])
+    collection.insert_one(document(object_id_at(30, 0), -1))
+
+    first = np.asarray(ingestion.export_collection_into_feature_store())
+    assert first.shape == (4,)
+
+    ## a document created before the watermark that committed after the first run, plus two new ones
+    collection.insert_one(document(object_id_at(10, 7), 0))
+    collection.insert_many([document(object_id_at(45, 0), 1), document(object_id_at(90, 0), 0)])
+
+    second = np.asarray(ingestion.export_collection_into_feature_store())
+    assert second.shape == (7,)
+    np.testing.assert_array_equal(second[:4], first)
+
+    third = np.asarray(ingestion.export_collection_into_feature_store())
+    np.testing.assert_array_equal(third, second)
+
+
+def test_full_refresh_rebuilds_the_store(ingestion):
+    collection = ingestion.mongo_client[ingestion.data_ingestion_config.database_name][
+        ingestion.data_ingestion_config.collection_name]
+    collection.insert_many([document(object_id_at(seconds, 0), 1) for seconds in range(5)])
+    ingestion.export_collection_into_feature_store()
+    collection.delete_one({"_id": object_id_at(0, 0)})
+
+    assert np.asarray(ingestion.export_collection_into_feature_store(full_refresh=True)).shape == (4,)
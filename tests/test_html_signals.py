@@ -0,0 +1,60 @@
+import pytest
+
+from networksecurity.utils.main_utils.html_signals import PageSignals, collect_page_signals
+
+bs4 = pytest.importorskip("bs4")
+
+PAGES = [
+    "",
+    "<html><head><title>empty</title></head><body>nothing here</body></html>",
+    """<html><head>
+        <link rel="stylesheet" href="/style.css">
+        <LINK REL="Shortcut ICON" HREF="https://cdn.example.net/favicon.ico">
+        <link rel="icon" href="/second.ico">
+        <meta http-equiv="refresh" href="/meta">
+        <script src="https://tracker.example.org/t.js"></script>
+        <script href="/odd.js">window.open('https://popup.example')</script>
+      </head><body>
+        <img src="logo.png"><img alt="no source"><img src="" href="/fallback.png">
+        <a href="#top">top</a><a href>bare</a><a href="">empty</a><a name="no-href">x</a>
+        <a href="javascript:void(0)">js</a><a href="mailto:admin@example.com">mail</a>
+        <a href="https://other.example.com/?a=1&amp;b=2">entity</a>
+        <form action="https://collect.example.biz/post"></form><form action></form><form></form>
+        <div onmouseover="steal()" oncontextmenu="return false">hover</div>
+        <iframe src="https://frame.example"></iframe><IFRAME></IFRAME>
+      </body></html>""",
+    """<link rel="icon"><script>
+        document.addEventListener('contextmenu', function(e) { e.preventDefault(); });
+        if (event.button==2) {}
+      </script><p>unclosed <b>markup <a href="/x">link""",
+    """<link rel="apple-touch-icon" href="/touch.png"><link href="/before-rel.css" rel=icon>
+       <a href="/dup" href="/dup-last">duplicate attribute</a>""",
+]
+
+
+def reference_signals(html: str) -> PageSignals:
+    ## what the features read from BeautifulSoup before the single pass parser
+    soup = bs4.BeautifulSoup(html, "html.parser")
+    icon_link = soup.find("link", rel=lambda value: value and "icon" in value.lower())
+    html_lower = html.lower()
+    return PageSignals(
+        found_icon_link=icon_link is not None,
+        icon_href=icon_link.get("href") if icon_link is not None else None,
+        resources=[tag.get("src") or tag.get("href") for tag in soup.find_all(["img", "script", "link"])
+                   if tag.get("src") or tag.get("href")],
+        anchor_hrefs=[a["href"] for a in soup.find_all("a", href=True)],
+        links_in_tags=sum(len(soup.find_all(tag_name, href=True)) for tag_name in ["link", "meta", "script"]),
+        form_actions=[form["action"] for form in soup.find_all("form", action=True)],
+        has_mailto=soup.find(href=lambda href: href and href.startswith("mailto:")) is not None,
+        has_onmouseover=soup.find(attrs={"onmouseover": True}) is not None,
+        has_oncontextmenu=soup.find(attrs={"oncontextmenu": True}) is not None,
+        iframe_count=len(soup.find_all("iframe")),
+        has_window_open="window.open" in html,
+        has_contextmenu_script="event.button==2" in html_lower or (
+            "preventdefault" in html_lower and "contextmenu" in html_lower),
+    )
+
+
+@pytest.mark.parametrize("html", PAGES)
+def test_single_pass_matches_beautifulsoup(html):
+    assert collect_page_signals(html) == reference_signals(html)
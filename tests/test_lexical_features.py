@@ -0,0 +1,67 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from networksecurity.utils.main_utils import feature_extraction
+from networksecurity.utils.main_utils.lexical_features import (
+    LEXICAL_FEATURE_COLUMNS,
+    extract_lexical_features,
+    extract_lexical_matrix,
+)
+
+URLS = [
+    "https://www.example.com/login",
+    "http://192.168.0.1/admin",
+    "https://bit.ly/3abc",
+    "http://user@evil.example.co.uk:8080/path//redirect",
+    "https://secure-paypal.com.a.b.phish.net/https/login?next=//x",
+    "http://https-bank.example.org",
+    "//cdn.example.com/script.js",
+    "https://[2001:db8::1]:8443/",
+    "example.com",
+    "",
+    "https://a.very.deep.sub.domain.example.com/" + "x" * 80,
+    "https://example.com:70000/",
+]
+
+
+def scalar_features(url):
+    return [getattr(feature_extraction, column)(url) for column in LEXICAL_FEATURE_COLUMNS]
+
+
+def test_batch_features_match_the_scalar_functions():
+    features = extract_lexical_features(pd.Series(URLS))
+
+    assert list(features.columns) == LEXICAL_FEATURE_COLUMNS
+    np.testing.assert_array_equal(features.to_numpy(dtype=np.int64), [scalar_features(url) for url in URLS])
+
+
+def test_arrow_input_matches_a_series():
+    pa = pytest.importorskip("pyarrow", exc_type=ImportError)
+
+    pd.testing.assert_frame_equal(extract_lexical_features(pa.array(URLS)), extract_lexical_features(URLS))
+
+
+def test_shortener_check_does_not_warn_about_match_groups():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        extract_lexical_features(URLS)
+
+
+def test_matrix_is_coded_like_the_dataset():
+    matrix = extract_lexical_matrix(URLS, chunk_size=5)
+    features = extract_lexical_features(URLS)
+
+    assert matrix.dtype == np.int8 and matrix.shape == (len(URLS), len(LEXICAL_FEATURE_COLUMNS))
+    assert set(np.unique(matrix)) <= {-1, 0, 1}
+    coded = pd.DataFrame(matrix, columns=LEXICAL_FEATURE_COLUMNS)
+    ## a flag raised by a scalar function is the phishing code
+    np.testing.assert_array_equal(coded["having_At_Symbol"], np.where(features["having_At_Symbol"] == 1, -1, 1))
+    np.testing.assert_array_equal(coded["URL_Length"],
+                                  np.select([features["URL_Length"] < 54, features["URL_Length"] <= 75], [1, 0], -1))
+    np.testing.assert_array_equal(coded["port"], np.where(features["port"].isin([80, 443]), 1, -1))
+    np.testing.assert_array_equal(coded["having_Sub_Domain"],
+                                  np.select([features["having_Sub_Domain"] == 0, features["having_Sub_Domain"] == 1],
+                                            [1, 0], -1))
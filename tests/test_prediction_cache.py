@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from networksecurity.utils.ml_utils.model.prediction_cache import PredictionCache
+
+
+class CountingModel:
+    """
+    Predicts the sum of each row and records the rows it was asked for
+    """
+    def __init__(self, offset=0):
+        self.offset = offset
+        self.calls = []
+
+    def predict(self, x):
+        x = np.asarray(x, dtype=float)
+        self.calls.append(x.copy())
+        return np.nansum(x, axis=1) + self.offset
+
+
+ROWS = np.array([[1, 0, -1], [1, 1, 1], [-1, -1, 0], [0, 0, 0]], dtype=float)
+
+
+def test_only_misses_reach_the_model():
+    cache, model = PredictionCache(max_size=10), CountingModel()
+
+    first = cache.predict(model, ROWS[:2])
+    second = cache.predict(model, ROWS)
+
+    np.testing.assert_array_equal(first, [0, 3])
+    np.testing.assert_array_equal(second, [0, 3, -2, 0])
+    np.testing.assert_array_equal(model.calls[1], ROWS[2:])
+    assert cache.stats() == {"size": 4, "max_size": 10, "hits": 2, "misses": 4}
+
+    cache.predict(model, ROWS[::-1])
+    assert len(model.calls) == 2
+
+
+def test_rows_that_do_not_pack_always_reach_the_model():
+    cache, model = PredictionCache(max_size=10), CountingModel()
+    x = np.array([[0.5, 0, 1], [np.nan, 1, 1]])
+
+    cache.predict(model, x)
+    np.testing.assert_array_equal(cache.predict(model, x), [1.5, 2])
+
+    np.testing.assert_array_equal(model.calls[1], x[:1])
+    assert cache.stats()["size"] == 1
+
+
+def test_least_recently_used_rows_are_evicted():
+    cache, model = PredictionCache(max_size=2), CountingModel()
+    cache.predict(model, ROWS[:2])
+    ## touch the first row so the second is the oldest
+    cache.predict(model, ROWS[:1])
+    cache.predict(model, ROWS[2:3])
+
+    assert cache.stats()["size"] == 2
+    cache.predict(model, ROWS[:3])
+    np.testing.assert_array_equal(model.calls[-1], ROWS[1:2])
+
+
+def test_clear_invalidates_entries_and_predictions_in_flight():
+    cache, old_model, new_model = PredictionCache(max_size=10), CountingModel(), CountingModel(offset=10)
+    cache.predict(old_model, ROWS[:2])
+    stale_generation = cache.generation
+
+    cache.clear()
+    ## a request that started before the swap still answers but must not store its result
+    cache.predict(old_model, ROWS[2:], generation=stale_generation)
+
+    np.testing.assert_array_equal(cache.predict(new_model, ROWS), [10, 13, 8, 10])
+    assert cache.stats()["size"] == 4
+    np.testing.assert_array_equal(cache.predict(new_model, ROWS), [10, 13, 8, 10])
+    assert len(new_model.calls) == 1
+
+
+def test_dataframe_misses_keep_their_columns():
+    cache, model = PredictionCache(max_size=10), CountingModel()
+    x = pd.DataFrame(ROWS, columns=["a", "b", "c"])
+    cache.predict(model, x.iloc[:1])
+
+    received = []
+    model.predict = lambda frame: received.append(frame) or np.zeros(len(frame))
+    cache.predict(model, x)
+
+    assert isinstance(received[0], pd.DataFrame)
+    assert list(received[0].index) == [1, 2, 3]
@@ -0,0 +1,37 @@
+import mongomock
+import pandas as pd
+
+from push_data import NetworkDataExtract
+
+
+def write_csv(path, rows):
+    pd.DataFrame(rows, columns=["having_IP_Address", "URL_Length", "Result"]).to_csv(path, index=False)
+    return str(path)
+
+
+ROWS = [[1, -1, 1], [1, -1, 1], [-1, 0, -1], [None, 1, 1]]
+
+
+def test_reloading_the_same_rows_under_another_name_inserts_nothing(tmp_path):
+    client = mongomock.MongoClient()
+    loader = NetworkDataExtract(mongo_client=client, max_workers=2)
+
+    first = loader.load_csv(write_csv(tmp_path / "export.csv", ROWS), "db", "data", chunk_size=3, batch_size=2)
+    again = loader.load_csv(write_csv(tmp_path / "export_copy.csv", ROWS), "db", "data", chunk_size=2, batch_size=3)
+
+    ## the repeated row is a second sample, not a duplicate
+    assert first["rows_inserted"] == 4
+    assert again["rows_read"] == 4 and again["rows_inserted"] == 0
+    assert client["db"]["data"].count_documents({}) == 4
+    assert client["db"]["data"].count_documents({"having_IP_Address": None}) == 1
+
+
+def test_only_new_rows_and_extra_repeats_are_inserted(tmp_path):
+    client = mongomock.MongoClient()
+    loader = NetworkDataExtract(mongo_client=client, max_workers=2)
+    loader.load_csv(write_csv(tmp_path / "day1.csv", ROWS), "db", "data")
+
+    report = loader.load_csv(write_csv(tmp_path / "day2.csv", ROWS + [[1, -1, 1], [0, 0, 1]]), "db", "data")
+
+    assert report["rows_inserted"] == 2
+    assert client["db"]["data"].count_documents({"having_IP_Address": 1, "URL_Length": -1}) == 3
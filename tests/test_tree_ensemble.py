@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import ExtraTreesClassifier, GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from networksecurity.utils.ml_utils.model.tree_ensemble import (
+    DISTINCT_ROWS_MIN_BATCH,
+    EVALUATION_BLOCK_SIZE,
+    CompiledTreeEnsemble,
+    calibrate_sklearn_crossover,
+    compile_tree_ensemble,
+)
+
+
+def make_dataset(rows, seed=0):
+    ## same shape as the phishing features: ternary -1/0/1 columns and a -1/1 target
+    rng = np.random.default_rng(seed)
+    x = rng.integers(-1, 2, size=(rows, 30)).astype(np.float64)
+    y = np.where(x[:, 0] + x[:, 5] - x[:, 12] + rng.normal(0, 0.8, rows) > 0, 1, -1)
+    return x, y
+
+
+@pytest.mark.parametrize("model", [
+    DecisionTreeClassifier(random_state=0),
+    RandomForestClassifier(n_estimators=16, random_state=0),
+    ExtraTreesClassifier(n_estimators=16, random_state=0),
+    GradientBoostingClassifier(n_estimators=32, random_state=0),
+])
+def test_compiled_model_predicts_like_sklearn(model):
+    x_train, y_train = make_dataset(2000)
+    ## more rows than one evaluation block, so block boundaries are covered
+    x_test, _ = make_dataset(EVALUATION_BLOCK_SIZE + 500, seed=1)
+    model.fit(x_train, y_train)
+
+    compiled = CompiledTreeEnsemble.from_sklearn(model)
+
+    np.testing.assert_array_equal(compiled.predict(x_test), model.predict(x_test))
+    np.testing.assert_array_equal(compiled.predict(x_test[0]), model.predict(x_test[:1]))
+
+
+def test_compiled_model_predicts_imputed_values_like_sklearn():
+    x_train, y_train = make_dataset(2000)
+    ## KNN imputation leaves fractional values between the -1/0/1 thresholds
+    x_test = make_dataset(1000, seed=2)[0] + np.random.default_rng(3).uniform(-0.5, 0.5, size=(1000, 30))
+    model = RandomForestClassifier(n_estimators=16, random_state=0).fit(x_train, y_train)
+
+    np.testing.assert_array_equal(CompiledTreeEnsemble.from_sklearn(model).predict(x_test), model.predict(x_test))
+
+
+def test_compiled_model_handles_an_empty_batch():
+    x_train, y_train = make_dataset(500)
+    model = DecisionTreeClassifier(random_state=0).fit(x_train, y_train)
+
+    assert CompiledTreeEnsemble.from_sklearn(model).predict(np.empty((0, 30))).shape == (0,)
+
+
+def test_unsupported_model_is_not_compiled():
+    x_train, y_train = make_dataset(500)
+    model = LogisticRegression().fit(x_train, y_train)
+
+    assert compile_tree_ensemble(model, x_train) is None
+
+
+def test_repeated_and_unpackable_rows_predict_like_sklearn():
+    x_train, y_train = make_dataset(2000)
+    model = RandomForestClassifier(n_estimators=16, random_state=0).fit(x_train, y_train)
+    ## a batch large enough to be deduplicated, mostly repeats of 50 rows plus imputed ones
+    x_test = np.resize(make_dataset(50, seed=4)[0], (DISTINCT_ROWS_MIN_BATCH * 2, 30))
+    x_test[::7] += np.random.default_rng(5).uniform(-0.5, 0.5, size=x_test[::7].shape)
+
+    np.testing.assert_array_equal(CompiledTreeEnsemble.from_sklearn(model).predict(x_test), model.predict(x_test))
+
+
+def test_gradient_boosting_tie_predicts_the_first_class():
+    ## one stump whose leaves cancel the initial score exactly
+    compiled = CompiledTreeEnsemble(
+        feature=np.array([0, 0, 0]), threshold=np.array([0.5, 0.0, 0.0]),
+        left=np.array([1, 1, 2]), right=np.array([2, 1, 2]),
+        value=np.array([[0.0], [-1.0], [0.0]]), roots=np.array([0]), max_depth=1,
+        classes=np.array([-1, 1]), kind="gradient_boosting", init_score=1.0,
+    )
+
+    np.testing.assert_array_equal(compiled.predict(np.array([[0.0], [1.0]])), [-1, 1])
+
+
+def test_large_batches_are_handed_to_sklearn_after_calibration():
+    x_train, y_train = make_dataset(2000)
+    model = GradientBoostingClassifier(n_estimators=32, random_state=0).fit(x_train, y_train)
+    compiled = calibrate_sklearn_crossover(model, CompiledTreeEnsemble.from_sklearn(model), x_train,
+                                           batch_sizes=(1, 64), repeats=1)
+    assert compiled.sklearn_model in (None, model)
+
+    compiled.sklearn_model, compiled.sklearn_min_rows = model, 64
+    x_test, _ = make_dataset(500, seed=6)
+    np.testing.assert_array_equal(compiled.predict(x_test), model.predict(x_test))
+    np.testing.assert_array_equal(compiled.predict(x_test[:10]), model.predict(x_test[:10]))
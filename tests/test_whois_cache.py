@@ -0,0 +1,110 @@
+import sqlite3
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from networksecurity.utils.main_utils import whois_cache
+from networksecurity.utils.main_utils.whois_cache import WhoisCache
+
+
+class FakeWhois:
+    """
+    Stands in for whois.whois, counting queries per domain
+    """
+    def __init__(self, answers):
+        self.answers = answers
+        self.calls = []
+
+    def __call__(self, domain):
+        self.calls.append(domain)
+        answer = self.answers[domain]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(whois_cache.time, "time", clock)
+    return clock
+
+
+def install(monkeypatch, answers):
+    fake = FakeWhois(answers)
+    monkeypatch.setattr(whois_cache.whois, "whois", fake)
+    return fake
+
+
+def answer(creation_date, expiration_date=None, domain_name="example.com"):
+    return SimpleNamespace(domain_name=domain_name, creation_date=creation_date, expiration_date=expiration_date)
+
+
+def test_answer_is_served_from_the_cache_until_its_ttl_expires(tmp_path, monkeypatch, clock):
+    created = datetime(2001, 5, 4, 3, 2, 1)
+    fake = install(monkeypatch, {"example.com": answer([created, datetime(2002, 1, 1)], datetime(2030, 1, 1))})
+    cache = WhoisCache(str(tmp_path / "whois.db"), ttl_seconds=100, negative_ttl_seconds=10)
+
+    first = cache.lookup("example.com")
+    clock.now += 99
+    second = cache.lookup("example.com")
+
+    assert first == second
+    assert second.creation_date == created
+    assert second.expiration_date == datetime(2030, 1, 1)
+    assert fake.calls == ["example.com"]
+
+    clock.now += 2
+    cache.lookup("example.com")
+    assert fake.calls == ["example.com", "example.com"]
+
+
+def test_failed_lookup_is_cached_for_the_negative_ttl(tmp_path, monkeypatch, clock):
+    fake = install(monkeypatch, {"example.com": TimeoutError("rate limited")})
+    cache = WhoisCache(str(tmp_path / "whois.db"), ttl_seconds=100, negative_ttl_seconds=10)
+
+    assert cache.lookup("example.com") is None
+    clock.now += 9
+    assert cache.lookup("example.com") is None
+    assert len(fake.calls) == 1
+
+    clock.now += 2
+    cache.lookup("example.com")
+    assert len(fake.calls) == 2
+
+
+def test_unparsed_dates_are_dropped_before_they_are_stored(tmp_path, monkeypatch, clock):
+    ## python-whois returns the registry's text when it does not know the date format
+    fake = install(monkeypatch, {"example.com": answer("04-May-2001 UTC", ["not a date"])})
+    cache = WhoisCache(str(tmp_path / "whois.db"))
+
+    record = cache.lookup("example.com")
+
+    assert record.domain_name == "example.com"
+    assert record.creation_date is None and record.expiration_date is None
+    assert cache.lookup("example.com") == record
+    assert len(fake.calls) == 1
+
+
+def test_undecodable_cached_date_is_a_cache_miss(tmp_path, monkeypatch, clock):
+    created = datetime(2001, 5, 4)
+    fake = install(monkeypatch, {"example.com": answer(created)})
+    db_path = str(tmp_path / "whois.db")
+    cache = WhoisCache(db_path)
+    cache.lookup("example.com")
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("UPDATE whois_cache SET creation_date = '04-May-2001 UTC'")
+
+    record = cache.lookup("example.com")
+
+    assert record.creation_date == created
+    assert len(fake.calls) == 2